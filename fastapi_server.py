@@ -5,120 +5,258 @@ Maps the legacy HTTP API endpoints (used by DecodingTrust-Agent evaluation frame
 to the new Desktop service class methods.
 
 Usage:
-    uv run fastapi_server.py [--port PORT]
+    uv run fastapi_server.py [--port PORT] [--workers N]
+
+windows_mcp is imported from the installed project (`uv sync` installs it in editable mode).
+
+When installed, httptools and uvloop (winloop on Windows) are used for the HTTP parser
+and event loop.
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Literal, Optional, List, Union
-from textwrap import dedent
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from typing import Annotated, Literal, Optional, List, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import monotonic
+from uuid import uuid4
+from windows_mcp.desktop.service import Desktop
+from windows_mcp.desktop.powershell import PowerShellSession
+import windows_mcp.uia as uia
+import pyautogui as pg
+import pyperclip as pc
+import importlib.util
+import argparse
+import asyncio
+import anyio
 import base64
 import uvicorn
-import sys
 import os
+import re
 import truststore
 
 truststore.inject_into_ssl()  # Use Windows system CA certificates for HTTPS
 
-# Add src to path so we can import windows_mcp
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-
-from windows_mcp.desktop.service import Desktop
-
-import pyautogui as pg
-import pyperclip as pc
-
 pg.FAILSAFE = False
 pg.PAUSE = 0
 
-desktop = Desktop()
-windows_version = desktop.get_windows_version()
-default_language = desktop.get_default_language()
+LAUNCH_WAIT_TIMEOUT = 2.0
+STATE_CACHE_TTL = 0.25  # seconds a non-vision snapshot is reused for identical requests
+MAX_STORED_SCREENSHOTS = 8
+# Set by __main__ for --workers; screenshot_url needs one process because the store is per worker
+WORKERS = int(os.getenv("WINDOWS_MCP_WORKERS", "1"))
+CLICK_NAMES = ("Hover", "Single", "Double", "Triple")
+
+# Initialized in lifespan so that every uvicorn worker process gets its own instances
+desktop: Desktop | None = None
+windows_version: str | None = None
+default_language: str | None = None
+# Long-lived PowerShell host for /tools/powershell. The file fallbacks use the Desktop's own
+# session instead, so a user's cd or variables cannot change how their paths resolve.
+powershell: PowerShellSession | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global desktop, windows_version, default_language, powershell
+    desktop = Desktop()
+    windows_version = desktop.get_windows_version()
+    default_language = desktop.get_default_language()
+    powershell = PowerShellSession()
+    app.description = f"FastAPI server providing tools to interact with {windows_version} desktop"
+    try:
+        yield
+    finally:
+        powershell.close()
+        desktop.close()
+
 
 app = FastAPI(
     title="Windows MCP API",
-    description=f"FastAPI server providing tools to interact with {windows_version} desktop",
+    description="FastAPI server providing tools to interact with the Windows desktop",
     version="2.0.0",
+    lifespan=lifespan,
+)
+
+# Short-lived snapshot cache: {use_ui_tree: (timestamp, DesktopState)}. Screenshots are never
+# cached to bound memory, and every UI action clears the cache so state is never stale.
+_state_cache: dict[bool, tuple[float, object]] = {}
+_state_cache_lock = asyncio.Lock()
+# Bumped by every UI action; a capture only enters the cache if no action ran while it was taken
+_state_generation = 0
+# (image bytes, media type) served by /tools/state/screenshot, evicted oldest first
+_screenshots: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+# Single thread for all UI input; initialized for UI Automation like the Desktop's own workers
+_input_executor = ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="ui-input",
+    initializer=uia.InitializeUIAutomationInCurrentThread,
+)
+# Single thread for UI Automation reads (snapshots, window lookups). One thread also keeps
+# concurrent snapshots from racing on desktop.desktop_state.
+_uia_executor = ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="uia",
+    initializer=uia.InitializeUIAutomationInCurrentThread,
 )
 
 
-class LaunchToolRequest(BaseModel):
+def invalidate_state() -> None:
+    """Drop cached snapshots and mark any capture still in flight as stale."""
+    global _state_generation
+    _state_generation += 1
+    _state_cache.clear()
+
+
+async def run_action(func, *args, **kwargs):
+    """Run a blocking desktop action that does not touch UI Automation (PowerShell, files) in
+    a worker thread and invalidate cached state."""
+    try:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    finally:
+        invalidate_state()
+
+
+async def run_input_action(func, *args, **kwargs):
+    """run_action for actions that drive the mouse, keyboard or window focus. They run one at a
+    time on a single thread in arrival order, so overlapping requests never interleave input."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_input_executor, partial(func, *args, **kwargs))
+    finally:
+        invalidate_state()
+
+
+async def run_uia(func, *args, **kwargs):
+    """Run a blocking UI Automation read on the UIA thread. Unlike run_action it changes nothing
+    on screen, so cached state stays valid."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_uia_executor, partial(func, *args, **kwargs))
+
+
+def resolve_local_path(path: str) -> str | None:
+    """Resolve a plain filesystem path the way the PowerShell fallback would (relative
+    paths against the home directory). Returns None for UNC paths, wildcards and
+    PowerShell provider paths (e.g. HKLM:, Env:), which still go through PowerShell."""
+    if path.startswith(("\\\\", "//")) or any(c in path for c in "*?[]"):
+        return None
+    if re.match(r"^[A-Za-z]{2,}:", path):
+        return None
+    return os.path.join(os.path.expanduser("~"), os.path.expanduser(path))
+
+
+def write_local_file(path: str, content: str, mode: Literal["overwrite", "append"]) -> None:
+    # Writes the content's UTF-8 bytes exactly: newline="" keeps its line endings (text mode
+    # would turn \n into \r\n on Windows), with no BOM and no added trailing newline. The
+    # PowerShell fallback in edit_file_tool writes the same bytes.
+    with open(path, "a" if mode == "append" else "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+
+
+# Exactly two integers ([x, y] or [width, height]), validated by pydantic-core
+XY = tuple[int, int]
+
+
+class ToolRequest(BaseModel):
+    # Build validators at import time and skip per-request copies of frozen inputs
+    model_config = ConfigDict(extra="ignore", defer_build=False, frozen=True)
+
+
+class LaunchToolRequest(ToolRequest):
     name: str
 
 
-class PowershellToolRequest(BaseModel):
+class PowershellToolRequest(ToolRequest):
     command: str
     timeout: int = 30
 
 
-class StateToolRequest(BaseModel):
-    use_vision: bool = False
+StateField = Literal["active_window", "windows", "interactive"]
 
 
-class ClipboardToolRequest(BaseModel):
+class StateToolRequest(ToolRequest):
+    use_vision: bool = False
+    # False returns a screenshot_url for /tools/state/screenshot instead of inline base64.
+    # Only available with one worker, since each worker keeps its own screenshot store.
+    inline_screenshot: bool = True
+    # Sections of the state text to render; None renders all of them
+    fields: Optional[frozenset[StateField]] = None
+    # False skips UIA enumeration entirely and returns only the screenshot
+    use_ui_tree: bool = True
+    # jpeg/webp encode several times faster than png at the cost of lossy output
+    image_format: Literal["png", "jpeg", "webp"] = "png"
+
+
+class ClipboardToolRequest(ToolRequest):
     mode: Literal["copy", "paste", "get", "set"]
     text: Optional[str] = None
 
 
-class ClickToolRequest(BaseModel):
-    loc: List[int]
+class ClickToolRequest(ToolRequest):
+    loc: XY
     button: Literal["left", "right", "middle"] = "left"
     clicks: int = 1
 
 
-class TypeToolRequest(BaseModel):
-    loc: Optional[List[int]] = None
+class TypeToolRequest(ToolRequest):
+    loc: Optional[XY] = None
     text: str
     clear: bool = False
     press_enter: bool = False
+    # Seconds between characters; 0 sends the whole text in one SendInput call
+    interval: float = 0.0
 
 
-class ResizeToolRequest(BaseModel):
-    size: Optional[List[int]] = None
-    loc: Optional[List[int]] = None
+class ResizeToolRequest(ToolRequest):
+    size: Optional[XY] = None
+    loc: Optional[XY] = None
 
 
-class SwitchToolRequest(BaseModel):
+class SwitchToolRequest(ToolRequest):
     name: str
 
 
-class ScrollToolRequest(BaseModel):
-    loc: Optional[List[int]] = None
+class ScrollToolRequest(ToolRequest):
+    loc: Optional[XY] = None
     type: Literal["horizontal", "vertical"] = "vertical"
     direction: Literal["up", "down", "left", "right"] = "down"
     wheel_times: int = 1
 
 
-class DragToolRequest(BaseModel):
-    from_loc: List[int]
-    to_loc: List[int]
+class DragToolRequest(ToolRequest):
+    from_loc: XY
+    to_loc: XY
 
 
-class MoveToolRequest(BaseModel):
-    to_loc: List[int]
+class MoveToolRequest(ToolRequest):
+    to_loc: XY
 
 
-class ShortcutToolRequest(BaseModel):
-    shortcut: Union[List[str], str]
+class ShortcutToolRequest(ToolRequest):
+    shortcut: Union[List[str], str] = Field(union_mode="left_to_right")
 
 
-class KeyToolRequest(BaseModel):
+class KeyToolRequest(ToolRequest):
     key: str
 
 
-class WaitToolRequest(BaseModel):
+class WaitToolRequest(ToolRequest):
     duration: int
 
 
-class ScrapeToolRequest(BaseModel):
+class ScrapeToolRequest(ToolRequest):
     url: str
 
 
-class ReadFileRequest(BaseModel):
+class ReadFileRequest(ToolRequest):
     path: str
 
 
-class EditFileRequest(BaseModel):
+class EditFileRequest(ToolRequest):
     path: str
     content: str
     mode: Literal["overwrite", "append"] = "overwrite"
@@ -129,6 +267,58 @@ class ToolResponse(BaseModel):
     status: str = "success"
 
 
+class ClickAction(ClickToolRequest):
+    op: Literal["click"]
+
+
+class TypeAction(TypeToolRequest):
+    op: Literal["type"]
+
+
+class ScrollAction(ScrollToolRequest):
+    op: Literal["scroll"]
+
+
+class MoveAction(MoveToolRequest):
+    op: Literal["move"]
+
+
+class ShortcutAction(ShortcutToolRequest):
+    op: Literal["shortcut"]
+
+
+class KeyAction(KeyToolRequest):
+    op: Literal["key"]
+
+
+class WaitAction(WaitToolRequest):
+    op: Literal["wait"]
+
+
+ActionRequest = Annotated[
+    Union[ClickAction, TypeAction, ScrollAction, MoveAction, ShortcutAction, KeyAction, WaitAction],
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(ToolRequest):
+    actions: List[ActionRequest]
+
+
+# Validated straight from the raw body, skipping FastAPI's per-request body model resolution
+BATCH_ADAPTER = TypeAdapter(BatchRequest)
+# The endpoint reads the raw body, so its schema is documented by hand. Nested models are
+# referenced from components and merged into the OpenAPI document by openapi_with_batch_schemas.
+BATCH_SCHEMA = BATCH_ADAPTER.json_schema(ref_template="#/components/schemas/{model}")
+BATCH_SCHEMA_DEFS = BATCH_SCHEMA.pop("$defs", {})
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Report any unexpected failure in a tool as a 500 with the error message as detail."""
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
+
 @app.get("/")
 async def root():
     return {
@@ -140,319 +330,370 @@ async def root():
 
 @app.post("/tools/launch", response_model=ToolResponse)
 async def launch_tool(request: LaunchToolRequest):
-    try:
-        response, status, pid = desktop.launch_app(request.name.lower())
-        if status != 0:
+    response, status, pid = await run_action(desktop.launch_app, request.name.lower())
+    if status != 0:
+        return ToolResponse(result=response)
+    # Poll with exponential backoff (0.1, 0.2, 0.4, 0.8s) instead of fixed 1s sleeps
+    delay, waited = 0.1, 0.0
+    while waited < LAUNCH_WAIT_TIMEOUT:
+        if await run_uia(desktop.is_app_running, request.name):
             return ToolResponse(result=response)
-        consecutive_waits = 2
-        for _ in range(consecutive_waits):
-            if not desktop.is_app_running(request.name):
-                pg.sleep(1.0)
-            else:
-                return ToolResponse(result=response)
-        return ToolResponse(result=f"Launching {request.name.title()} wait for it to come load.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        step = min(delay, LAUNCH_WAIT_TIMEOUT - waited)
+        await asyncio.sleep(step)
+        waited += step
+        delay *= 2
+    # The last sleep ends at the timeout; check once more so an app that started during it counts
+    if await run_uia(desktop.is_app_running, request.name):
+        return ToolResponse(result=response)
+    return ToolResponse(result=f"Launching {request.name.title()} wait for it to come load.")
 
 
 @app.post("/tools/powershell", response_model=ToolResponse)
 async def powershell_tool(request: PowershellToolRequest):
-    try:
-        response, status_code = desktop.execute_command(request.command, timeout=request.timeout)
-        return ToolResponse(result=f"Response: {response}\nStatus Code: {status_code}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response, status_code = await run_action(
+        powershell.execute, request.command, timeout=request.timeout
+    )
+    return ToolResponse(result=f"Response: {response}\nStatus Code: {status_code}")
 
 
 @app.post("/tools/state", response_model=ToolResponse)
 async def state_tool(request: StateToolRequest):
-    try:
-        desktop_state = desktop.get_state(
-            use_vision=request.use_vision, as_bytes=request.use_vision
+    if request.use_vision and not request.inline_screenshot and WORKERS > 1:
+        # The follow-up GET could land on another worker, which never saw this screenshot
+        raise HTTPException(
+            status_code=400,
+            detail="inline_screenshot=false requires a single worker (--workers 1)",
         )
-        accessibility_tree = desktop_state.tree_state.interactive_elements_to_string()
-        windows = desktop_state.windows_to_string()
-        active_window = desktop_state.active_window_to_string()
-
-        state_text = dedent(f"""
-        Default Language of User:
-        {default_language} with encoding: {desktop.encoding}
-
-        Focused Window:
-        {active_window}
+    if request.use_vision:
+        desktop_state = await run_uia(
+            desktop.get_state,
+            use_vision=True,
+            as_bytes=True,
+            use_ui_tree=request.use_ui_tree,
+            image_format=request.image_format,
+        )
+    else:
+        # Only non-vision snapshots are cached; vision requests always take a fresh capture
+        key = request.use_ui_tree
+        async with _state_cache_lock:
+            cached = _state_cache.get(key)
+            if cached is not None and monotonic() - cached[0] < STATE_CACHE_TTL:
+                desktop_state = cached[1]
+            else:
+                # Stamped with the start of the capture, and dropped if an action ran meanwhile
+                started, generation = monotonic(), _state_generation
+                desktop_state = await run_uia(desktop.get_state, use_ui_tree=request.use_ui_tree)
+                if generation == _state_generation:
+                    _state_cache[key] = (started, desktop_state)
+    # Only render the sections the caller asked for; each is a full pass over its nodes
+    fields = request.fields
+
+    def render(field: StateField, to_string) -> str:
+        return to_string() if fields is None or field in fields else "Not requested."
+
+    accessibility_tree = (
+        render("interactive", desktop_state.tree_state.interactive_elements_to_string)
+        or "No elements found."
+    )
+    state_text = "\n".join(
+        (
+            "",
+            "Default Language of User:",
+            f"{default_language} with encoding: {desktop.encoding}",
+            "",
+            "Focused Window:",
+            render("active_window", desktop_state.active_window_to_string),
+            "",
+            "Opened Windows:",
+            render("windows", desktop_state.windows_to_string),
+            "",
+            "Accessibility Tree:",
+            accessibility_tree,
+            "",
+        )
+    )
 
-        Opened Windows:
-        {windows}
+    result = {"state": state_text}
+    if request.use_vision and desktop_state.screenshot:
+        if request.inline_screenshot:
+            result["screenshot"] = base64.b64encode(desktop_state.screenshot).decode("ascii")
+        else:
+            screenshot_id = uuid4().hex
+            _screenshots[screenshot_id] = (
+                desktop_state.screenshot,
+                f"image/{request.image_format}",
+            )
+            while len(_screenshots) > MAX_STORED_SCREENSHOTS:
+                _screenshots.popitem(last=False)
+            result["screenshot_url"] = f"/tools/state/screenshot?id={screenshot_id}"
 
-        Accessibility Tree:
-        {accessibility_tree or "No elements found."}
-        """)
+    return ToolResponse(result=result)
 
-        result = {"state": state_text}
-        if request.use_vision and desktop_state.screenshot:
-            result["screenshot"] = base64.b64encode(desktop_state.screenshot).decode("utf-8")
 
-        return ToolResponse(result=result)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/tools/state/screenshot")
+async def state_screenshot(id: str):
+    """Serve a screenshot captured by /tools/state as raw image bytes."""
+    stored = _screenshots.get(id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Screenshot {id} not found or expired")
+    screenshot, media_type = stored
+    return Response(content=screenshot, media_type=media_type)
 
 
 @app.post("/tools/clipboard", response_model=ToolResponse)
 async def clipboard_tool(request: ClipboardToolRequest):
-    try:
-        if request.mode in ("copy", "set"):
-            if request.text:
-                pc.copy(request.text)
-                return ToolResponse(result=f'Copied "{request.text}" to clipboard')
-            else:
-                raise HTTPException(status_code=400, detail="No text provided to copy")
-        elif request.mode in ("paste", "get"):
-            clipboard_content = pc.paste()
-            return ToolResponse(result=f'Clipboard Content: "{clipboard_content}"')
+    if request.mode in ("copy", "set"):
+        if request.text:
+            await asyncio.to_thread(pc.copy, request.text)
+            return ToolResponse(result=f'Copied "{request.text}" to clipboard')
         else:
-            raise HTTPException(
-                status_code=400,
-                detail='Invalid mode. Use "copy"/"set" or "paste"/"get".',
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+            raise HTTPException(status_code=400, detail="No text provided to copy")
+    elif request.mode in ("paste", "get"):
+        clipboard_content = await asyncio.to_thread(pc.paste)
+        return ToolResponse(result=f'Clipboard Content: "{clipboard_content}"')
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail='Invalid mode. Use "copy"/"set" or "paste"/"get".',
+        )
 
 
 @app.post("/tools/click", response_model=ToolResponse)
 async def click_tool(request: ClickToolRequest):
-    try:
-        if len(request.loc) != 2:
-            raise HTTPException(
-                status_code=400,
-                detail="Location must be a list of exactly 2 integers [x, y]",
-            )
-        x, y = request.loc[0], request.loc[1]
-        desktop.click(loc=(x, y), button=request.button, clicks=request.clicks)
-        num_clicks = {0: "Hover", 1: "Single", 2: "Double", 3: "Triple"}
-        return ToolResponse(
-            result=f"{num_clicks.get(request.clicks, 'Multi')} {request.button} Clicked at ({x},{y})."
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    x, y = request.loc
+    await run_input_action(
+        desktop.click, loc=request.loc, button=request.button, clicks=request.clicks
+    )
+    click_name = CLICK_NAMES[request.clicks] if 0 <= request.clicks < 4 else "Multi"
+    return ToolResponse(result=f"{click_name} {request.button} Clicked at ({x},{y}).")
 
 
 @app.post("/tools/type", response_model=ToolResponse)
 async def type_tool(request: TypeToolRequest):
-    try:
-        loc = None
-        if request.loc is not None:
-            if len(request.loc) != 2:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Location must be a list of exactly 2 integers [x, y]",
-                )
-            loc = (request.loc[0], request.loc[1])
-        desktop.type(
-            loc=loc,
-            text=request.text,
-            clear=request.clear,
-            press_enter=request.press_enter,
-        )
-        if loc:
-            return ToolResponse(result=f"Typed {request.text} at ({loc[0]},{loc[1]}).")
-        return ToolResponse(result=f"Typed {request.text} at current focus.")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    loc = request.loc
+    await run_input_action(
+        desktop.type,
+        loc=loc,
+        text=request.text,
+        clear=request.clear,
+        press_enter=request.press_enter,
+        interval=request.interval,
+    )
+    if loc:
+        return ToolResponse(result=f"Typed {request.text} at ({loc[0]},{loc[1]}).")
+    return ToolResponse(result=f"Typed {request.text} at current focus.")
 
 
 @app.post("/tools/resize", response_model=ToolResponse)
 async def resize_tool(request: ResizeToolRequest):
-    try:
-        if request.size is not None and len(request.size) != 2:
-            raise HTTPException(
-                status_code=400,
-                detail="Size must be a list of exactly 2 integers [width, height]",
-            )
-        if request.loc is not None and len(request.loc) != 2:
-            raise HTTPException(
-                status_code=400,
-                detail="Location must be a list of exactly 2 integers [x, y]",
-            )
-        size_tuple = tuple(request.size) if request.size is not None else None
-        loc_tuple = tuple(request.loc) if request.loc is not None else None
-        response, _ = desktop.resize_app(size_tuple, loc_tuple)
-        return ToolResponse(result=response)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response, _ = await run_input_action(desktop.resize_app, request.size, request.loc)
+    return ToolResponse(result=response)
 
 
 @app.post("/tools/switch", response_model=ToolResponse)
 async def switch_tool(request: SwitchToolRequest):
-    try:
-        response, status = desktop.switch_app(request.name)
-        return ToolResponse(result=response)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response, status = await run_input_action(desktop.switch_app, request.name)
+    return ToolResponse(result=response)
 
 
 @app.post("/tools/scroll", response_model=ToolResponse)
 async def scroll_tool(request: ScrollToolRequest):
-    try:
-        loc_tuple = None
-        if request.loc:
-            if len(request.loc) != 2:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Location must be a list of exactly 2 integers [x, y]",
-                )
-            loc_tuple = (request.loc[0], request.loc[1])
-
-        response = desktop.scroll(
-            loc=loc_tuple,
-            type=request.type,
-            direction=request.direction,
-            wheel_times=request.wheel_times,
-        )
-        if response:
-            return ToolResponse(result=response)
-        return ToolResponse(
-            result=f"Scrolled {request.type} {request.direction} by {request.wheel_times} wheel times."
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await run_input_action(
+        desktop.scroll,
+        loc=request.loc,
+        type=request.type,
+        direction=request.direction,
+        wheel_times=request.wheel_times,
+    )
+    if response:
+        return ToolResponse(result=response)
+    return ToolResponse(
+        result=f"Scrolled {request.type} {request.direction} by {request.wheel_times} wheel times."
+    )
 
 
 @app.post("/tools/drag", response_model=ToolResponse)
 async def drag_tool(request: DragToolRequest):
-    try:
-        if len(request.from_loc) != 2:
-            raise HTTPException(
-                status_code=400,
-                detail="from_loc must be a list of exactly 2 integers [x, y]",
-            )
-        if len(request.to_loc) != 2:
-            raise HTTPException(
-                status_code=400,
-                detail="to_loc must be a list of exactly 2 integers [x, y]",
-            )
-        x1, y1 = request.from_loc[0], request.from_loc[1]
-        x2, y2 = request.to_loc[0], request.to_loc[1]
+    x1, y1 = request.from_loc
+    x2, y2 = request.to_loc
+
+    def drag():
+        # Press-and-drag as one input action, so no other request can move the cursor in between
         pg.moveTo(x1, y1)
-        desktop.drag(loc=(x2, y2))
-        return ToolResponse(result=f"Dragged from ({x1},{y1}) to ({x2},{y2}).")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        desktop.drag(loc=request.to_loc)
+
+    await run_input_action(drag)
+    return ToolResponse(result=f"Dragged from ({x1},{y1}) to ({x2},{y2}).")
 
 
 @app.post("/tools/move", response_model=ToolResponse)
 async def move_tool(request: MoveToolRequest):
-    try:
-        if len(request.to_loc) != 2:
-            raise HTTPException(
-                status_code=400,
-                detail="to_loc must be a list of exactly 2 integers [x, y]",
-            )
-        x, y = request.to_loc[0], request.to_loc[1]
-        desktop.move(loc=(x, y))
-        return ToolResponse(result=f"Moved the mouse pointer to ({x},{y}).")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    x, y = request.to_loc
+    await run_input_action(desktop.move, loc=request.to_loc)
+    return ToolResponse(result=f"Moved the mouse pointer to ({x},{y}).")
 
 
 @app.post("/tools/shortcut", response_model=ToolResponse)
 async def shortcut_tool(request: ShortcutToolRequest):
-    try:
-        # Support both old format (list of keys) and new format (single string with +)
-        if isinstance(request.shortcut, list):
-            shortcut_str = "+".join(request.shortcut)
-        else:
-            shortcut_str = request.shortcut
-        desktop.shortcut(shortcut_str)
-        return ToolResponse(result=f"Pressed {shortcut_str}.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Support both old format (list of keys) and new format (single string with +)
+    if isinstance(request.shortcut, list):
+        shortcut_str = "+".join(request.shortcut)
+    else:
+        shortcut_str = request.shortcut
+    await run_input_action(desktop.shortcut, shortcut_str)
+    return ToolResponse(result=f"Pressed {shortcut_str}.")
 
 
 @app.post("/tools/key", response_model=ToolResponse)
 async def key_tool(request: KeyToolRequest):
-    try:
-        pg.press(request.key)
-        return ToolResponse(result=f"Pressed the key {request.key}.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    await run_input_action(pg.press, request.key)
+    return ToolResponse(result=f"Pressed the key {request.key}.")
 
 
 @app.post("/tools/wait", response_model=ToolResponse)
 async def wait_tool(request: WaitToolRequest):
-    try:
-        pg.sleep(request.duration)
-        return ToolResponse(result=f"Waited for {request.duration} seconds.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.sleep(request.duration)
+    return ToolResponse(result=f"Waited for {request.duration} seconds.")
 
 
 @app.post("/tools/scrape", response_model=ToolResponse)
 async def scrape_tool(request: ScrapeToolRequest):
-    try:
-        content = desktop.scrape(request.url)
-        return ToolResponse(result=f"Scraped the contents of the entire webpage:\n{content}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    content = await asyncio.to_thread(desktop.scrape, request.url)
+    return ToolResponse(result=f"Scraped the contents of the entire webpage:\n{content}")
 
 
 @app.post("/tools/read", response_model=ToolResponse)
 async def read_file_tool(request: ReadFileRequest):
-    try:
-        path = request.path.replace("'", "''")
-        response, status_code = desktop.execute_command(
-            f"Get-Content -Path '{path}' -Raw",
-            timeout=10,
-        )
-        if status_code != 0:
-            return ToolResponse(result=f"Error reading {request.path}: {response}", status="error")
-        return ToolResponse(result=response)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if local_path := resolve_local_path(request.path):
+        try:
+            # Decoded from bytes so line endings are preserved, like Get-Content -Raw
+            content = (await anyio.Path(local_path).read_bytes()).decode("utf-8-sig")
+            return ToolResponse(result=content)
+        except UnicodeDecodeError:
+            pass  # Not UTF-8; let PowerShell pick the file's encoding
+        except OSError as e:
+            return ToolResponse(result=f"Error reading {request.path}: {e}", status="error")
+    path = request.path.replace("'", "''")
+    response, status_code = await asyncio.to_thread(
+        desktop.execute_internal_command,
+        f"Get-Content -Path '{path}' -Raw",
+        timeout=10,
+    )
+    if status_code != 0:
+        return ToolResponse(result=f"Error reading {request.path}: {response}", status="error")
+    return ToolResponse(result=response)
 
 
 @app.post("/tools/edit", response_model=ToolResponse)
 async def edit_file_tool(request: EditFileRequest):
-    try:
-        path = request.path.replace("'", "''")
-        content_b64 = base64.b64encode(request.content.encode("utf-8")).decode("ascii")
-        if request.mode == "append":
-            ps_cmd = (
-                f"$bytes = [Convert]::FromBase64String('{content_b64}'); "
-                f"$text = [System.Text.Encoding]::UTF8.GetString($bytes); "
-                f"Add-Content -Path '{path}' -Value $text -Encoding UTF8"
-            )
-        else:
-            ps_cmd = (
-                f"$bytes = [Convert]::FromBase64String('{content_b64}'); "
-                f"$text = [System.Text.Encoding]::UTF8.GetString($bytes); "
-                f"Set-Content -Path '{path}' -Value $text -Encoding UTF8"
-            )
-        response, status_code = desktop.execute_command(ps_cmd, timeout=10)
-        if status_code != 0:
-            return ToolResponse(result=f"Error writing {request.path}: {response}", status="error")
+    if local_path := resolve_local_path(request.path):
+        try:
+            await run_action(write_local_file, local_path, request.content, request.mode)
+        except OSError as e:
+            return ToolResponse(result=f"Error writing {request.path}: {e}", status="error")
         return ToolResponse(result=f"Written to {request.path} ({request.mode})")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    path = request.path.replace("'", "''")
+    content_b64 = base64.b64encode(request.content.encode("utf-8")).decode("ascii")
+    # Raw bytes, like write_local_file: -Encoding UTF8 would add a BOM on Windows PowerShell
+    # and a string -Value gets a trailing newline
+    cmdlet = "Add-Content" if request.mode == "append" else "Set-Content"
+    ps_cmd = (
+        f"$bytes = [Convert]::FromBase64String('{content_b64}'); "
+        f"{cmdlet} -Path '{path}' -Value $bytes -Encoding Byte"
+    )
+    response, status_code = await run_action(desktop.execute_internal_command, ps_cmd, timeout=10)
+    if status_code != 0:
+        return ToolResponse(result=f"Error writing {request.path}: {response}", status="error")
+    return ToolResponse(result=f"Written to {request.path} ({request.mode})")
+
+
+BATCH_HANDLERS = {
+    "click": click_tool,
+    "type": type_tool,
+    "scroll": scroll_tool,
+    "move": move_tool,
+    "shortcut": shortcut_tool,
+    "key": key_tool,
+    "wait": wait_tool,
+}
+
+
+@app.post(
+    "/tools/batch",
+    response_model=ToolResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": BATCH_SCHEMA}},
+        }
+    },
+)
+async def batch_tool(request: Request):
+    """Run several UI actions in order within one HTTP round-trip, stopping at the first failure."""
+    try:
+        batch = BATCH_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    results = []
+    for action in batch.actions:
+        try:
+            response = await BATCH_HANDLERS[action.op](action)
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            results.append({"op": action.op, "result": detail, "status": "error"})
+            return ToolResponse(result=results, status="error")
+        results.append({"op": action.op, **response.model_dump()})
+    return ToolResponse(result=results)
+
+
+default_openapi = app.openapi
+
+
+def openapi_with_batch_schemas() -> dict:
+    """FastAPI's generated schema plus the models referenced by the /tools/batch body."""
+    schema = default_openapi()
+    components = schema.setdefault("components", {}).setdefault("schemas", {})
+    for name, definition in BATCH_SCHEMA_DEFS.items():
+        components.setdefault(name, definition)
+    return schema
+
+
+app.openapi = openapi_with_batch_schemas
+
+
+def select_event_loop() -> str:
+    """Pick the fastest installed event loop; uvloop has no Windows build, winloop is its port."""
+    if importlib.util.find_spec("uvloop"):
+        return "uvloop"
+    if importlib.util.find_spec("winloop"):
+        return "winloop:new_event_loop"
+    return "auto"
+
+
+def select_http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "auto"
 
 
 if __name__ == "__main__":
-    port = 8005
-    if "--port" in sys.argv:
-        idx = sys.argv.index("--port")
-        if idx + 1 < len(sys.argv):
-            port = int(sys.argv[idx + 1])
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    parser = argparse.ArgumentParser(description="Windows MCP FastAPI server")
+    parser.add_argument("--port", type=int, default=8005)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes. All workers drive the same mouse and keyboard, "
+        "and caches (state, screenshots) are per worker, so out-of-band screenshots "
+        "(inline_screenshot=false) are rejected when this is above 1.",
+    )
+    args = parser.parse_args()
+    # Read by each worker process when it imports this module
+    os.environ["WINDOWS_MCP_WORKERS"] = str(args.workers)
+    uvicorn.run(
+        "fastapi_server:app" if args.workers > 1 else app,
+        host="0.0.0.0",
+        port=args.port,
+        workers=args.workers,
+        loop=select_event_loop(),
+        http=select_http_protocol(),
+        log_level="warning",
+    )
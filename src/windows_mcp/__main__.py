@@ -16,6 +16,7 @@ import os
 load_dotenv()
 
 MAX_IMAGE_WIDTH, MAX_IMAGE_HEIGHT = 1920, 1080
+CLICK_NAMES = ("Hover", "Single", "Double", "Triple")
 pg.FAILSAFE = False
 pg.PAUSE = 1.0
 
@@ -50,6 +51,8 @@ async def lifespan(app: FastMCP):
     finally:
         if watchdog:
             watchdog.stop()
+        if desktop:
+            desktop.close()
         if analytics:
             await analytics.close()
 
@@ -181,13 +184,13 @@ def click_tool(
         raise ValueError("Location must be a list of exactly 2 integers [x, y]")
     x, y = loc[0], loc[1]
     desktop.click(loc=loc, button=button, clicks=clicks)
-    num_clicks = {0: "Hover", 1: "Single", 2: "Double"}
-    return f"{num_clicks.get(clicks)} {button} clicked at ({x},{y})."
+    click_name = CLICK_NAMES[clicks] if 0 <= clicks < 4 else "Multi"
+    return f"{click_name} {button} clicked at ({x},{y})."
 
 
 @mcp.tool(
     name="Type",
-    description="Types text at specified coordinates [x, y]. Set clear=True to clear existing text first, False to append. Set press_enter=True to submit after typing. Set caret_position to 'start' (beginning), 'end' (end), or 'idle' (default).",
+    description="Types text at specified coordinates [x, y]. Set clear=True to clear existing text first, False to append. Set press_enter=True to submit after typing. Set caret_position to 'start' (beginning), 'end' (end), or 'idle' (default). Text is sent in one burst; set interval to a delay in seconds between characters (e.g. 0.02) for apps that drop fast input.",
     annotations=ToolAnnotations(
         title="Type",
         readOnlyHint=False,
@@ -203,6 +206,7 @@ def type_tool(
     clear: bool | str = False,
     caret_position: Literal["start", "idle", "end"] = "idle",
     press_enter: bool | str = False,
+    interval: float = 0.0,
     ctx: Context = None,
 ) -> str:
     parsed_loc = None
@@ -216,6 +220,7 @@ def type_tool(
         caret_position=caret_position,
         clear=clear,
         press_enter=press_enter,
+        interval=interval,
     )
     if parsed_loc:
         return f"Typed {text} at ({parsed_loc[0]},{parsed_loc[1]})."
@@ -0,0 +1,131 @@
+from subprocess import Popen, PIPE, STDOUT
+from time import monotonic
+from uuid import uuid4
+import subprocess
+import threading
+import logging
+import base64
+import queue
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+CLOSE_TIMEOUT = 5  # seconds to wait for a killed host to exit and its reader to finish
+
+# Runs the base64 (UTF-16LE) payload, then prints a sentinel line carrying the exit status.
+# $Error is cleared first rather than compared by count: it is capped at $MaximumErrorCount,
+# so once full its count no longer changes when a command fails.
+# Everything is kept on one line because `-Command -` executes stdin line by line.
+COMMAND_TEMPLATE = (
+    "$__cmd = [Text.Encoding]::Unicode.GetString([Convert]::FromBase64String('{payload}')); "
+    "$Error.Clear(); $global:LASTEXITCODE = 0; "
+    "try {{ Invoke-Expression $__cmd 2>&1 | Out-String -Width 4096 }} catch {{ $_ | Out-String }}; "
+    "$__status = [int](($Error.Count -ne 0) -or ($LASTEXITCODE -ne 0)); "
+    "Write-Output ('{sentinel}:' + $__status)"
+)
+
+
+class PowerShellSession:
+    """A long-lived powershell.exe host that runs commands sent over stdin.
+
+    Spawning PowerShell costs hundreds of milliseconds per call; keeping one process
+    alive pays that cost once. Each command is followed by a unique sentinel line so its
+    output and status can be read back. State such as the current directory and
+    variables persists between commands, like an interactive shell.
+    """
+
+    def __init__(self, cwd: str | None = None):
+        self.cwd = cwd or os.path.expanduser("~")
+        self._process: Popen | None = None
+        self._output: queue.Queue[str | None] = queue.Queue()
+        self._reader: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._process = Popen(
+            ["powershell", "-NoProfile", "-NoLogo", "-NonInteractive", "-Command", "-"],
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=STDOUT,
+            cwd=self.cwd,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+        self._output = queue.Queue()
+        self._reader = threading.Thread(
+            target=self._read_output, args=(self._process.stdout, self._output), daemon=True
+        )
+        self._reader.start()
+        self._write(
+            "[Console]::OutputEncoding = [Text.Encoding]::UTF8; "
+            "$ProgressPreference = 'SilentlyContinue'"
+        )
+
+    @staticmethod
+    def _read_output(stream, output: queue.Queue):
+        try:
+            for line in iter(stream.readline, b""):
+                output.put(line.decode("utf-8", errors="ignore").rstrip("\r\n"))
+        except (OSError, ValueError):
+            pass  # The pipe was closed under us by close()
+        output.put(None)  # EOF: the host exited
+
+    def _write(self, line: str):
+        self._process.stdin.write(f"{line}\n".encode("ascii"))
+        self._process.stdin.flush()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def execute(self, command: str, timeout: int = 10) -> tuple[str, int]:
+        """Run a command in the session and return (output, status)."""
+        with self._lock:
+            try:
+                if not self.is_alive():
+                    self._start()
+                sentinel = f"<<<EOT:{uuid4().hex}>>>"
+                payload = base64.b64encode(command.encode("utf-16le")).decode("ascii")
+                self._write(COMMAND_TEMPLATE.format(payload=payload, sentinel=sentinel))
+            except Exception as e:
+                self.close()
+                return (f"Command execution failed: {type(e).__name__}: {e}", 1)
+
+            lines = []
+            deadline = monotonic() + timeout
+            while True:
+                try:
+                    line = self._output.get(timeout=max(deadline - monotonic(), 0))
+                except queue.Empty:
+                    # The host is stuck on this command; it cannot be interrupted, so recycle it
+                    self.close()
+                    return ("Command execution timed out", 1)
+                if line is None:
+                    self.close()
+                    return ("\n".join(lines) or "PowerShell session exited", 1)
+                # Output without a trailing newline (Write-Host -NoNewline, [Console]::Write)
+                # puts the sentinel mid-line, after the command's last text
+                before, found, status = line.partition(sentinel)
+                if found:
+                    if before:
+                        lines.append(before)
+                    return ("\n".join(lines), int(status.lstrip(":")))
+                lines.append(line)
+
+    def close(self):
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        try:
+            process.kill()
+            process.wait(timeout=CLOSE_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Failed to stop PowerShell session: {e}")
+        # The reader sees EOF once the host is gone; let it finish before closing its pipe
+        if self._reader is not None:
+            self._reader.join(timeout=CLOSE_TIMEOUT)
+            self._reader = None
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Failed to close PowerShell pipe: {e}")
@@ -0,0 +1,172 @@
+from dataclasses import dataclass
+from ctypes import wintypes
+import logging
+import ctypes
+import psutil
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROCESS_INFORMATION_CLASS = 5
+STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+INITIAL_BUFFER_SIZE = 512 * 1024
+
+try:
+    ntdll = ctypes.WinDLL("ntdll")
+    ntdll.NtQuerySystemInformation.argtypes = [
+        wintypes.ULONG,
+        ctypes.c_void_p,
+        wintypes.ULONG,
+        ctypes.POINTER(wintypes.ULONG),
+    ]
+    ntdll.NtQuerySystemInformation.restype = wintypes.ULONG  # NTSTATUS, read unsigned
+except (AttributeError, OSError):
+    ntdll = None
+
+
+class UNICODE_STRING(ctypes.Structure):
+    _fields_ = [
+        ("Length", wintypes.USHORT),
+        ("MaximumLength", wintypes.USHORT),
+        ("Buffer", ctypes.c_void_p),
+    ]
+
+
+class SYSTEM_PROCESS_INFORMATION(ctypes.Structure):
+    # Leading fields only; entries are walked with NextEntryOffset, never by sizeof
+    _fields_ = [
+        ("NextEntryOffset", wintypes.ULONG),
+        ("NumberOfThreads", wintypes.ULONG),
+        ("WorkingSetPrivateSize", ctypes.c_longlong),
+        ("HardFaultCount", wintypes.ULONG),
+        ("NumberOfThreadsHighWatermark", wintypes.ULONG),
+        ("CycleTime", ctypes.c_ulonglong),
+        ("CreateTime", ctypes.c_longlong),
+        ("UserTime", ctypes.c_longlong),
+        ("KernelTime", ctypes.c_longlong),
+        ("ImageName", UNICODE_STRING),
+        ("BasePriority", wintypes.LONG),
+        ("UniqueProcessId", ctypes.c_void_p),
+        ("InheritedFromUniqueProcessId", ctypes.c_void_p),
+        ("HandleCount", wintypes.ULONG),
+        ("SessionId", wintypes.ULONG),
+        ("UniqueProcessKey", ctypes.c_size_t),
+        ("PeakVirtualSize", ctypes.c_size_t),
+        ("VirtualSize", ctypes.c_size_t),
+        ("PageFaultCount", wintypes.ULONG),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+    ]
+
+
+@dataclass
+class ProcessInfo:
+    pid: int
+    name: str
+    memory: int  # working set (RSS) in bytes
+    cpu_time: float  # user + kernel seconds
+
+
+def _query_system_processes() -> list[ProcessInfo]:
+    """Read every process in one NtQuerySystemInformation(SystemProcessInformation) call,
+    instead of opening a handle per process like psutil.process_iter."""
+    size = INITIAL_BUFFER_SIZE
+    while True:
+        buffer = ctypes.create_string_buffer(size)
+        needed = wintypes.ULONG(0)
+        status = ntdll.NtQuerySystemInformation(
+            SYSTEM_PROCESS_INFORMATION_CLASS, buffer, size, ctypes.byref(needed)
+        )
+        if status == STATUS_INFO_LENGTH_MISMATCH:
+            # Processes can start between calls, so leave some headroom
+            size = needed.value + 64 * 1024
+            continue
+        if status != 0:
+            raise OSError(f"NtQuerySystemInformation failed with NTSTATUS 0x{status:08X}")
+        break
+
+    processes = []
+    base = ctypes.addressof(buffer)
+    offset = 0
+    while True:
+        entry = SYSTEM_PROCESS_INFORMATION.from_address(base + offset)
+        pid = entry.UniqueProcessId or 0
+        image = entry.ImageName
+        if image.Buffer:
+            name = ctypes.wstring_at(image.Buffer, image.Length // 2)
+        else:
+            name = "System Idle Process" if pid == 0 else "Unknown"
+        processes.append(
+            ProcessInfo(
+                pid=pid,
+                name=name,
+                memory=entry.WorkingSetSize,
+                cpu_time=(entry.UserTime + entry.KernelTime) / 10_000_000,  # 100 ns units
+            )
+        )
+        if not entry.NextEntryOffset:
+            return processes
+        offset += entry.NextEntryOffset
+
+
+def _iter_psutil_processes() -> list[ProcessInfo]:
+    processes = []
+    for p in psutil.process_iter(["pid", "name", "memory_info", "cpu_times"]):
+        info = p.info
+        memory, cpu_times = info["memory_info"], info["cpu_times"]
+        processes.append(
+            ProcessInfo(
+                pid=info["pid"],
+                name=info["name"] or "Unknown",
+                memory=memory.rss if memory else 0,
+                cpu_time=cpu_times.user + cpu_times.system if cpu_times else 0.0,
+            )
+        )
+    return processes
+
+
+def snapshot_processes() -> list[ProcessInfo]:
+    """Snapshot of all running processes, falling back to psutil when the native query fails."""
+    if ntdll is not None:
+        try:
+            return _query_system_processes()
+        except OSError as e:
+            logger.warning(f"NtQuerySystemInformation unavailable, falling back to psutil: {e}")
+    return _iter_psutil_processes()
+
+
+def cpu_percentages(
+    before: list[ProcessInfo], after: list[ProcessInfo], elapsed: float
+) -> dict[int, float]:
+    """CPU usage per pid between two snapshots, in percent of one core (like psutil)."""
+    if elapsed <= 0:
+        return {}
+    previous = {p.pid: p.cpu_time for p in before}
+    return {
+        p.pid: max(p.cpu_time - previous[p.pid], 0.0) / elapsed * 100
+        for p in after
+        if p.pid in previous
+    }
+
+
+def format_process_table(procs: list[dict]) -> str:
+    """Render list_processes rows (pid, name, cpu, mem_mb) laid out like tabulate's "simple"
+    format: PID right-aligned, the rest left-aligned, two spaces apart, with a dashed rule
+    under the header. cpu is None when it was not sampled."""
+    rows = [
+        (
+            str(p["pid"]),
+            p["name"],
+            f"{p['cpu']:.1f}%" if p["cpu"] is not None else "-",
+            f"{p['mem_mb']:.1f} MB",
+        )
+        for p in procs
+    ]
+    headers = ("PID", "Name", "CPU%", "Memory")
+    widths = [max(len(header), *(len(row[i]) for row in rows)) for i, header in enumerate(headers)]
+    rule = tuple("-" * width for width in widths)
+    pid_w, name_w, cpu_w, mem_w = widths
+    lines = [
+        f"{pid:>{pid_w}}  {pname:<{name_w}}  {pcpu:<{cpu_w}}  {mem:<{mem_w}}".rstrip()
+        for pid, pname, pcpu, mem in (headers, rule, *rows)
+    ]
+    return "\n".join(lines)
@@ -5,30 +5,44 @@ from windows_mcp.vdm.core import (
 )
 from windows_mcp.desktop.views import DesktopState, Window, Browser, Status, Size
 from windows_mcp.desktop.config import PROCESS_PER_MONITOR_DPI_AWARE
-from windows_mcp.tree.views import BoundingBox, TreeElementNode
+from windows_mcp.desktop.powershell import PowerShellSession
+from windows_mcp.desktop.processes import (
+    snapshot_processes,
+    cpu_percentages,
+    format_process_table,
+)
+from windows_mcp.tree.views import BoundingBox, TreeElementNode, TreeState
 from concurrent.futures import ThreadPoolExecutor
-from PIL import ImageGrab, ImageFont, ImageDraw, Image
+from PIL import ImageGrab, ImageFont, ImageDraw, ImageChops, Image
 from windows_mcp.tree.service import Tree
 from locale import getpreferredencoding
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape as xml_escape
+from textwrap import dedent
 from contextlib import contextmanager
+from ctypes import wintypes
+from functools import lru_cache
 from typing import Literal
 from markdownify import markdownify
-from thefuzz import process
+from rapidfuzz import fuzz, process, utils
 from time import time
-from psutil import Process
 import win32process
+import platform
+import psutil
 import subprocess
+import threading
 import win32gui
+import win32ui
 import win32con
 import requests
 import logging
 import base64
 import ctypes
+import winreg
 import csv
 import re
 import os
 import io
-import random
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -39,17 +53,240 @@ except Exception:
     ctypes.windll.user32.SetProcessDPIAware()
 
 import windows_mcp.uia as uia  # noqa: E402
+from windows_mcp.tree.cache_utils import CacheRequestFactory  # noqa: E402
 import pyautogui as pg  # noqa: E402
+import mss  # noqa: E402
+
+try:
+    # Optional: shows toasts in-process instead of through PowerShell's WinRT loader
+    from winrt.windows.ui.notifications import ToastNotification, ToastNotificationManager
+    from winrt.windows.data.xml.dom import XmlDocument
+except ImportError:
+    ToastNotification = ToastNotificationManager = XmlDocument = None
 
 pg.FAILSAFE = False
 pg.PAUSE = 0
 
+GW_HWNDNEXT = 2
+MAX_TOP_LEVEL_WINDOWS = 10000
+
+# Own handle so these prototypes do not change ctypes.windll.user32 for other modules
+user32 = ctypes.WinDLL("user32")
+user32.GetTopWindow.argtypes = [wintypes.HWND]
+user32.GetTopWindow.restype = wintypes.HWND
+user32.GetWindow.argtypes = [wintypes.HWND, wintypes.UINT]
+user32.GetWindow.restype = wintypes.HWND
+user32.IsWindowVisible.argtypes = [wintypes.HWND]
+user32.IsWindowVisible.restype = wintypes.BOOL
+
+
+class MEMORYSTATUSEX(ctypes.Structure):
+    _fields_ = [
+        ("dwLength", wintypes.DWORD),
+        ("dwMemoryLoad", wintypes.DWORD),
+        ("ullTotalPhys", ctypes.c_ulonglong),
+        ("ullAvailPhys", ctypes.c_ulonglong),
+        ("ullTotalPageFile", ctypes.c_ulonglong),
+        ("ullAvailPageFile", ctypes.c_ulonglong),
+        ("ullTotalVirtual", ctypes.c_ulonglong),
+        ("ullAvailVirtual", ctypes.c_ulonglong),
+        ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+    ]
+
+
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+kernel32.GlobalMemoryStatusEx.argtypes = [ctypes.POINTER(MEMORYSTATUSEX)]
+kernel32.GlobalMemoryStatusEx.restype = wintypes.BOOL
+kernel32.GetDiskFreeSpaceExW.argtypes = [
+    wintypes.LPCWSTR,
+    ctypes.POINTER(ctypes.c_ulonglong),
+    ctypes.POINTER(ctypes.c_ulonglong),
+    ctypes.POINTER(ctypes.c_ulonglong),
+]
+kernel32.GetDiskFreeSpaceExW.restype = wintypes.BOOL
+
+
+def get_memory_usage() -> tuple[int, int]:
+    """(used, total) bytes of physical memory from one GlobalMemoryStatusEx call."""
+    status = MEMORYSTATUSEX(dwLength=ctypes.sizeof(MEMORYSTATUSEX))
+    if not kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return status.ullTotalPhys - status.ullAvailPhys, status.ullTotalPhys
+
+
+def get_disk_usage(path: str) -> tuple[int, int]:
+    """(used, total) bytes of the volume holding path, with used = total - total free like
+    psutil.disk_usage (not the free space available to the caller, which quotas can shrink)."""
+    available, total, free = ctypes.c_ulonglong(), ctypes.c_ulonglong(), ctypes.c_ulonglong()
+    if not kernel32.GetDiskFreeSpaceExW(
+        path, ctypes.byref(available), ctypes.byref(total), ctypes.byref(free)
+    ):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return total.value - free.value, total.value
+
+
+# One xpath step, e.g. "PaneControl[2]"
+XPATH_PART_RE = re.compile(r"(\w+)(?:\[(\d+)\])?")
+
+CPU_SAMPLE_INTERVAL = 0.1  # seconds between the process snapshots list_processes compares
+
+CPU_PERCENT_INTERVAL = 0.5  # seconds each system CPU load reading averages over
+
+SCREEN_METRICS_TTL = 5  # seconds; picks up monitor hot-plug and scaling changes soon enough
+
+START_APPS_CACHE_TTL = 300  # seconds; Get-StartApps costs a PowerShell spawn per call
+
+# Reported when the virtual desktop API is unavailable or the UI tree is skipped
+DEFAULT_DESKTOP = {"id": "00000000-0000-0000-0000-000000000000", "name": "Default Desktop"}
+
+# Toast content for send_notification; title and message must already be XML-escaped
+NOTIFICATION_XML = (
+    "<toast>"
+    '<visual><binding template="ToastGeneric">'
+    "<text>{title}</text>"
+    "<text>{message}</text>"
+    "</binding></visual>"
+    "</toast>"
+)
+
+# PowerShell fallback for send_notification without winrt; title and message are assigned as
+# single-quoted PowerShell strings, which do NOT expand $() or backtick sequences
+NOTIFICATION_SCRIPT = (
+    "[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null\n"
+    "[Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null\n"
+    "$notifTitle = '{title}'\n"
+    "$notifMessage = '{message}'\n"
+    '$template = @"\n'
+    "<toast>\n"
+    "    <visual>\n"
+    '        <binding template="ToastGeneric">\n'
+    "            <text>$notifTitle</text>\n"
+    "            <text>$notifMessage</text>\n"
+    "        </binding>\n"
+    "    </visual>\n"
+    "</toast>\n"
+    '"@\n'
+    "$xml = New-Object Windows.Data.Xml.Dom.XmlDocument\n"
+    "$xml.LoadXml($template)\n"
+    '$notifier = [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Windows MCP")\n'
+    "$toast = New-Object Windows.UI.Notifications.ToastNotification $xml\n"
+    "$notifier.Show($toast)"
+)
+
+
+@lru_cache(maxsize=256)
+def parse_shortcut(shortcut: str) -> tuple[str, ...]:
+    """Split "ctrl+shift+c" into pyautogui key names. Agents resend the same few shortcuts,
+    so the result is memoized. Single characters keep their case (pyautogui maps "A" to
+    shift+a); named keys are lowercased."""
+    keys = (key.strip() for key in shortcut.split("+"))
+    return tuple(key if len(key) == 1 else key.lower() for key in keys)
+
+
+@lru_cache(maxsize=256)
+def _get_process_name(process_id: int, create_time: float) -> str:
+    return psutil.Process(process_id).name()
+
+
+def get_process_name(process_id: int) -> str:
+    """Executable name of a process. The same windows show up in every snapshot, so names are
+    memoized by (pid, create time): Windows reuses pids quickly, and the start time tells a
+    new process from the one that held its pid. Failed lookups raise and are not cached."""
+    return _get_process_name(process_id, psutil.Process(process_id).create_time())
+
+
+# Sent as key presses: KEYEVENTF_UNICODE delivers them as characters, which many controls ignore
+TEXT_CONTROL_KEYS = {"\n": uia.Keys.VK_RETURN, "\t": uia.Keys.VK_TAB}
+
+
+def send_unicode_text(text: str, interval: float = 0.0) -> int:
+    """Type text with KEYEVENTF_UNICODE SendInput events. Unlike pg.typewrite this reaches any
+    character regardless of keyboard layout, and without an interval the whole string goes in
+    one SendInput call. interval > 0 sends one character at a time for slow targets."""
+    strokes = []
+    for char in text.replace("\r\n", "\n"):
+        if vk := TEXT_CONTROL_KEYS.get(char):
+            strokes.append(
+                (
+                    uia.KeyboardInput(vk, 0, uia.KeyboardEventFlag.KeyDown),
+                    uia.KeyboardInput(vk, 0, uia.KeyboardEventFlag.KeyUp),
+                )
+            )
+            continue
+        # Characters outside the BMP are sent as their two UTF-16 surrogates
+        units = memoryview(char.encode("utf-16-le")).cast("H")
+        strokes.append(
+            tuple(
+                uia.KeyboardInput(0, unit, uia.KeyboardEventFlag.KeyUnicode | flag)
+                for unit in units
+                for flag in (uia.KeyboardEventFlag.KeyDown, uia.KeyboardEventFlag.KeyUp)
+            )
+        )
+    batches = [strokes] if interval <= 0 else [[stroke] for stroke in strokes]
+
+    sent = 0
+    for i, batch in enumerate(batches):
+        if i and interval > 0:
+            pg.sleep(interval)
+        events = [event for stroke in batch for event in stroke]
+        if not events:
+            continue
+        array = (uia.INPUT * len(events))(*events)
+        inserted = user32.SendInput(len(events), array, ctypes.sizeof(uia.INPUT))
+        if inserted != len(events):
+            logger.warning(f"SendInput inserted {inserted} of {len(events)} keyboard events")
+        sent += inserted
+    return sent
+
 
 class Desktop:
     def __init__(self):
         self.encoding = getpreferredencoding()
+        # Screen geometry only changes on monitor or scaling changes, so it is re-read at most
+        # every SCREEN_METRICS_TTL seconds. Set before Tree, which reads the screen size.
+        self._screen_size: tuple[float, Size] | None = None
+        self._scale_factor: tuple[float, float] | None = None
         self.tree = Tree(self)
         self.desktop_state = None
+        # WINDOWS_MCP_BACKEND=dxcam opts into DXGI desktop duplication; mss is the default
+        self.screenshot_backend = os.getenv("WINDOWS_MCP_BACKEND", "mss").lower()
+        # mss holds its GDI device contexts per thread, so every capturing thread (FastAPI runs
+        # captures in a thread pool) gets its own instance, created on first use
+        self._sct_local = threading.local()
+        # Created on the first grab so the DXGI duplication setup is paid once, not per shot
+        self._camera = None
+        self._camera_frame: Image.Image | None = None
+        self._last_screenshot_backend: str | None = None
+        self._start_apps_cache: tuple[float, dict[str, str]] | None = None
+        self._default_language: str | None = None
+        self._windows_version: str | None = None
+        # The desktop root's window handle never changes within a session. Only the handle is
+        # kept: UIA controls are COM objects and must not be shared across threads.
+        self._root_handle: int | None = None
+        # Keeps connections alive across scrapes of the same host
+        self._http = requests.Session()
+        # Long-lived worker for get_state queries that can overlap the window enumeration.
+        # Reusing the thread keeps its COM apartment and virtual desktop manager alive.
+        self._background = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="desktop-state",
+            initializer=uia.InitializeUIAutomationInCurrentThread,
+        )
+        # Long-lived host for the desktop's own queries; started on first use
+        self._powershell = PowerShellSession()
+        # Annotation font, loaded once instead of re-parsing the TTF on every screenshot
+        try:
+            self._font = ImageFont.truetype("arial.ttf", 15)
+        except IOError:
+            self._font = ImageFont.load_default()
+        # Anchor-relative bounding boxes of index labels drawn with _font, keyed by label text
+        self._label_bboxes: dict[str, tuple[int, int, int, int]] = {}
+        # System CPU load, refreshed in the background so get_system_info does not block on it.
+        # The sampler starts on the first get_system_info call and stops on close().
+        self._cpu_percent: float | None = None
+        self._cpu_sampler: threading.Thread | None = None
+        self._cpu_sampler_lock = threading.Lock()
+        self._cpu_sampler_stop = threading.Event()
 
     def get_state(
         self,
@@ -58,6 +295,8 @@ class Desktop:
         use_dom: bool | str = False,
         as_bytes: bool | str = False,
         scale: float = 1.0,
+        use_ui_tree: bool | str = True,
+        image_format: Literal["png", "jpeg", "webp"] = "png",
     ) -> DesktopState:
         use_annotation = use_annotation is True or (
             isinstance(use_annotation, str) and use_annotation.lower() == "true"
@@ -68,35 +307,42 @@ class Desktop:
         use_dom = use_dom is True or (isinstance(use_dom, str) and use_dom.lower() == "true")
         as_bytes = as_bytes is True or (isinstance(as_bytes, str) and as_bytes.lower() == "true")
 
+        use_ui_tree = use_ui_tree is True or (
+            isinstance(use_ui_tree, str) and use_ui_tree.lower() == "true"
+        )
+        if use_dom and not use_ui_tree:
+            raise ValueError("use_dom=True requires use_ui_tree=True")
+
         start_time = time()
 
-        controls_handles = self.get_controls_handles()  # Taskbar,Program Manager,Apps, Dialogs
-        windows, windows_handles = self.get_windows(controls_handles=controls_handles)  # Apps
-        active_window = self.get_active_window(windows=windows)  # Active Window
-        active_window_handle = active_window.handle if active_window else None
+        if use_ui_tree:
+            # The virtual desktop queries are independent of the window enumeration below
+            desktops_future = self._background.submit(self.get_desktops)
 
-        try:
-            active_desktop = get_current_desktop()
-            all_desktops = get_all_desktops()
-        except RuntimeError:
-            active_desktop = {
-                "id": "00000000-0000-0000-0000-000000000000",
-                "name": "Default Desktop",
-            }
-            all_desktops = [active_desktop]
+            controls_handles = self.get_controls_handles()  # Taskbar,Program Manager,Apps, Dialogs
+            windows, windows_handles = self.get_windows(controls_handles=controls_handles)  # Apps
+            active_window = self.get_active_window(windows=windows)  # Active Window
+            active_window_handle = active_window.handle if active_window else None
 
-        if active_window is not None and active_window in windows:
-            windows.remove(active_window)
+            active_desktop, all_desktops = desktops_future.result()
 
-        logger.debug(f"Active window: {active_window or 'No Active Window Found'}")
-        logger.debug(f"Windows: {windows}")
+            if active_window is not None and active_window in windows:
+                windows.remove(active_window)
 
-        # Preparing handles for Tree
-        other_windows_handles = list(controls_handles - windows_handles)
+            logger.debug(f"Active window: {active_window or 'No Active Window Found'}")
+            logger.debug(f"Windows: {windows}")
 
-        tree_state = self.tree.get_state(
-            active_window_handle, other_windows_handles, use_dom=use_dom
-        )
+            # Preparing handles for Tree
+            other_windows_handles = list(controls_handles - windows_handles)
+
+            tree_state = self.tree.get_state(
+                active_window_handle, other_windows_handles, use_dom=use_dom
+            )
+        else:
+            # Screenshot-only snapshot: no UIA enumeration, virtual desktop or tree traversal
+            active_window, windows = None, []
+            active_desktop, all_desktops = DEFAULT_DESKTOP, [DEFAULT_DESKTOP]
+            tree_state = TreeState()
 
         if use_vision:
             if use_annotation and tree_state.marks:
@@ -108,16 +354,10 @@ class Desktop:
                 screenshot = self.get_screenshot()
 
             if scale != 1.0:
-                screenshot = screenshot.resize(
-                    (int(screenshot.width * scale), int(screenshot.height * scale)),
-                    Image.LANCZOS,
-                )
+                screenshot = self.resize_screenshot(screenshot, scale)
 
             if as_bytes:
-                buffered = io.BytesIO()
-                screenshot.save(buffered, format="PNG")
-                screenshot = buffered.getvalue()
-                buffered.close()
+                screenshot = self.encode_screenshot(screenshot, image_format)
         else:
             screenshot = None
 
@@ -128,18 +368,52 @@ class Desktop:
             all_desktops=all_desktops,
             screenshot=screenshot,
             tree_state=tree_state,
+            screenshot_backend=self._last_screenshot_backend if use_vision else None,
         )
         # Log the time taken to capture the state
         end_time = time()
         logger.info(f"Desktop State capture took {end_time - start_time:.2f} seconds")
         return self.desktop_state
 
+    @staticmethod
+    def resize_screenshot(screenshot: Image.Image, scale: float) -> Image.Image:
+        """Downscale a screenshot. Mild reductions (the usual 4K/1440p to 1080p cap) use
+        BILINEAR, which looks the same at that ratio and is far cheaper than LANCZOS. Larger
+        reductions keep LANCZOS but let Pillow box-reduce first via reducing_gap."""
+        size = (int(screenshot.width * scale), int(screenshot.height * scale))
+        if scale >= 0.5:
+            return screenshot.resize(size, Image.BILINEAR, reducing_gap=2.0)
+        return screenshot.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+    @staticmethod
+    def encode_screenshot(
+        screenshot: Image.Image, image_format: Literal["png", "jpeg", "webp"] = "png"
+    ) -> bytes:
+        """Encode a screenshot. PNG is lossless but its DEFLATE pass dominates on large frames;
+        JPEG and WebP are several times faster to encode when a lossy image is acceptable."""
+        buffered = io.BytesIO()
+        if image_format == "jpeg":
+            screenshot.convert("RGB").save(buffered, format="JPEG", quality=80, optimize=False)
+        elif image_format == "webp":
+            screenshot.save(buffered, format="WEBP", quality=80, method=0)
+        else:
+            screenshot.save(buffered, format="PNG")
+        return buffered.getvalue()
+
+    def get_desktops(self) -> tuple[dict, list[dict]]:
+        """Return the current virtual desktop and all virtual desktops."""
+        try:
+            return get_current_desktop(), get_all_desktops()
+        except RuntimeError:
+            return DEFAULT_DESKTOP, [DEFAULT_DESKTOP]
+
     def get_window_status(self, control: uia.Control) -> Status:
-        if uia.IsIconic(control.NativeWindowHandle):
+        handle = control.NativeWindowHandle
+        if uia.IsIconic(handle):
             return Status.MINIMIZED
-        elif uia.IsZoomed(control.NativeWindowHandle):
+        elif uia.IsZoomed(handle):
             return Status.MAXIMIZED
-        elif uia.IsWindowVisible(control.NativeWindowHandle):
+        elif uia.IsWindowVisible(handle):
             return Status.NORMAL
         else:
             return Status.HIDDEN
@@ -151,9 +425,14 @@ class Desktop:
     def get_element_under_cursor(self) -> uia.Control:
         return uia.ControlFromCursor()
 
-    def get_apps_from_start_menu(self) -> dict[str, str]:
+    def get_apps_from_start_menu(self, refresh: bool = False) -> dict[str, str]:
+        if not refresh and self._start_apps_cache is not None:
+            cached_at, apps = self._start_apps_cache
+            if time() - cached_at < START_APPS_CACHE_TTL:
+                return apps
+
         command = "Get-StartApps | ConvertTo-Csv -NoTypeInformation"
-        apps_info, status = self.execute_command(command)
+        apps_info, status = self.execute_internal_command(command)
 
         if status != 0 or not apps_info:
             logger.error(f"Failed to get apps from start menu: {apps_info}")
@@ -161,11 +440,13 @@ class Desktop:
 
         try:
             reader = csv.DictReader(io.StringIO(apps_info.strip()))
-            return {
+            apps = {
                 row.get("Name", "").lower(): row.get("AppID", "")
                 for row in reader
                 if row.get("Name") and row.get("AppID")
             }
+            self._start_apps_cache = (time(), apps)
+            return apps
         except Exception as e:
             logger.error(f"Error parsing start menu apps: {e}")
             return {}
@@ -185,7 +466,6 @@ class Desktop:
                 capture_output=True,  # No errors='ignore' - let subprocess return bytes
                 timeout=timeout,
                 cwd=os.path.expanduser(path="~"),
-                env=os.environ.copy(),  # Inherit environment variables including PATH
             )
             # Handle both bytes and str output (subprocess behavior varies by environment)
             stdout = result.stdout
@@ -200,19 +480,43 @@ class Desktop:
         except Exception as e:
             return (f"Command execution failed: {type(e).__name__}: {e}", 1)
 
+    def execute_internal_command(self, command: str, timeout: int = 10) -> tuple[str, int]:
+        """Run one of the desktop's own PowerShell queries (start menu, culture, OS caption,
+        launching apps...) in a persistent session instead of spawning powershell.exe each
+        time. User commands keep going through execute_command, so they cannot change the
+        session's state."""
+        return self._powershell.execute(command, timeout=timeout)
+
+    def close(self):
+        """Stop the desktop's PowerShell host and CPU sampler. Call on shutdown."""
+        self._cpu_sampler_stop.set()
+        self._powershell.close()
+
     def is_window_browser(self, node: uia.Control):
         """Give any node of the app and it will return True if the app is a browser, False otherwise."""
         try:
-            process = Process(node.ProcessId)
-            return Browser.has_process(process.name())
+            return self.is_process_browser(node.ProcessId)
+        except Exception:
+            return False
+
+    def is_process_browser(self, process_id: int) -> bool:
+        try:
+            return Browser.has_process(get_process_name(process_id))
         except Exception:
             return False
 
     def get_default_language(self) -> str:
+        # The culture does not change while the process runs
+        if self._default_language is not None:
+            return self._default_language
         command = "Get-Culture | Select-Object Name,DisplayName | ConvertTo-Csv -NoTypeInformation"
-        response, _ = self.execute_command(command)
+        response, status = self.execute_internal_command(command)
         reader = csv.DictReader(io.StringIO(response))
-        return "".join([row.get("DisplayName") for row in reader])
+        language = "".join([row.get("DisplayName") for row in reader])
+        # A failed or timed-out query is not remembered, so the next call tries again
+        if status == 0:
+            self._default_language = language
+        return language
 
     def resize_app(
         self, size: tuple[int, int] = None, loc: tuple[int, int] = None
@@ -226,14 +530,10 @@ class Desktop:
             return f"{active_window.name} is maximized", 1
         else:
             window_control = uia.ControlFromHandle(active_window.handle)
-            if loc is None:
-                x = window_control.BoundingRectangle.left
-                y = window_control.BoundingRectangle.top
-                loc = (x, y)
-            if size is None:
-                width = window_control.BoundingRectangle.width()
-                height = window_control.BoundingRectangle.height()
-                size = (width, height)
+            if loc is None or size is None:
+                rect = window_control.BoundingRectangle
+                loc = loc or (rect.left, rect.top)
+                size = size or (rect.width(), rect.height())
             x, y = loc
             width, height = size
             window_control.MoveWindow(x, y, width, height)
@@ -241,8 +541,11 @@ class Desktop:
 
     def is_app_running(self, name: str) -> bool:
         windows, _ = self.get_windows()
-        windows_dict = {window.name: window for window in windows}
-        return process.extractOne(name, list(windows_dict.keys()), score_cutoff=60) is not None
+        window_names = tuple(window.name for window in windows)
+        return (
+            process.extractOne(name, window_names, processor=utils.default_process, score_cutoff=60)
+            is not None
+        )
 
     def app(
         self,
@@ -289,9 +592,19 @@ class Desktop:
 
     def launch_app(self, name: str) -> tuple[str, int, int]:
         apps_map = self.get_apps_from_start_menu()
-        matched_app = process.extractOne(name, apps_map.keys(), score_cutoff=70)
+        matched_app = process.extractOne(
+            name, tuple(apps_map), processor=utils.default_process, score_cutoff=70
+        )
         if matched_app is None:
-            suggestions = process.extract(name, list(apps_map.keys()), limit=5)
+            # The cached list may predate a fresh install; look again before giving up
+            apps_map = self.get_apps_from_start_menu(refresh=True)
+            matched_app = process.extractOne(
+                name, tuple(apps_map), processor=utils.default_process, score_cutoff=70
+            )
+        if matched_app is None:
+            suggestions = process.extract(
+                name, tuple(apps_map), processor=utils.default_process, limit=5
+            )
             if suggestions:
                 suggestion_names = [s[0] for s in suggestions]
                 hint = ", ".join(suggestion_names)
@@ -301,7 +614,7 @@ class Desktop:
                     0,
                 )
             return (f"{name.title()} not found in start menu.", 1, 0)
-        app_name, _ = matched_app
+        app_name = matched_app[0]
         appid = apps_map.get(app_name)
         if appid is None:
             return (f"{name.title()} not found in start menu.", 1, 0)
@@ -312,7 +625,7 @@ class Desktop:
             # Escape any single quotes and wrap in single quotes for PowerShell safety
             safe_appid = appid.replace("'", "''")
             command = f"Start-Process '{safe_appid}' -PassThru | Select-Object -ExpandProperty Id"
-            response, status = self.execute_command(command)
+            response, status = self.execute_internal_command(command)
             if status == 0 and response.strip().isdigit():
                 pid = int(response.strip())
         else:
@@ -327,7 +640,7 @@ class Desktop:
             ):
                 return (f"Invalid app identifier: {appid}", 1, 0)
             command = f'Start-Process "shell:AppsFolder\\{appid}"'
-            response, status = self.execute_command(command)
+            response, status = self.execute_internal_command(command)
 
         return response, status, pid
 
@@ -348,12 +661,12 @@ class Desktop:
                 return ("No windows found on the desktop.", 1)
 
             windows = {window.name: window for window in window_list}
-            matched_window: tuple[str, float] | None = process.extractOne(
-                name, list(windows.keys()), score_cutoff=70
+            matched_window: tuple[str, float, int] | None = process.extractOne(
+                name, tuple(windows), processor=utils.default_process, score_cutoff=70
             )
             if matched_window is None:
                 return (f"Application {name.title()} not found.", 1)
-            window_name, _ = matched_window
+            window_name = matched_window[0]
             window = windows.get(window_name)
             target_handle = window.handle
 
@@ -442,6 +755,7 @@ class Desktop:
         caret_position: Literal["start", "idle", "end"] = "idle",
         clear: bool | str = False,
         press_enter: bool | str = False,
+        interval: float = 0.0,
     ):
         if loc is not None:
             x, y = loc
@@ -459,7 +773,7 @@ class Desktop:
             pg.hotkey("ctrl", "a")
             pg.press("backspace")
 
-        pg.typewrite(text, interval=0.02)
+        send_unicode_text(text, interval=interval)
 
         if press_enter is True or (isinstance(press_enter, str) and press_enter.lower() == "true"):
             pg.press("enter")
@@ -512,11 +826,11 @@ class Desktop:
         pg.moveTo(x, y, duration=0.1)
 
     def shortcut(self, shortcut: str):
-        shortcut = shortcut.split("+")
-        if len(shortcut) > 1:
-            pg.hotkey(*shortcut)
+        keys = parse_shortcut(shortcut)
+        if len(keys) > 1:
+            pg.hotkey(*keys)
         else:
-            pg.press("".join(shortcut))
+            pg.press(keys[0])
 
     def multi_select(self, press_ctrl: bool | str = False, locs: list[tuple[int, int]] = []):
         press_ctrl = press_ctrl is True or (
@@ -537,7 +851,7 @@ class Desktop:
 
     def scrape(self, url: str) -> str:
         try:
-            response = requests.get(url, timeout=10)
+            response = self._http.get(url, timeout=10)
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             raise ValueError(f"HTTP error for {url}: {e}") from e
@@ -546,7 +860,8 @@ class Desktop:
         except requests.exceptions.Timeout as e:
             raise TimeoutError(f"Request timed out for {url}: {e}") from e
         html = response.text
-        content = markdownify(html=html)
+        # lxml is already a dependency and parses faster than bs4's default html.parser
+        content = markdownify(html=html, bs4_options="lxml")
         return content
 
     def get_window_from_element(self, element: uia.Control) -> Window | None:
@@ -570,29 +885,35 @@ class Desktop:
         return not is_overlay and is_minimized and area > 10
 
     def is_overlay_window(self, element: uia.Control) -> bool:
-        no_children = len(element.GetChildren()) == 0
-        is_name = "Overlay" in element.Name.strip()
-        return no_children or is_name
+        name = element.Name
+        if "Overlay" in name:
+            return True
+        # Probe for a first child instead of materializing every child as a Control
+        return element.GetFirstChildControl() is None
 
     def get_controls_handles(self, optimized: bool = False):
         handles = set()
 
-        # For even more faster results (still under development)
-        def callback(hwnd, _):
+        # Walk the top-level z-order directly instead of dispatching a Python callback per
+        # window through EnumWindows. The walk is capped in case the z-order changes under it.
+        visible = []
+        hwnd = user32.GetTopWindow(None)
+        for _ in range(MAX_TOP_LEVEL_WINDOWS):
+            if not hwnd:
+                break
+            if user32.IsWindowVisible(hwnd):
+                visible.append(hwnd)
+            hwnd = user32.GetWindow(hwnd, GW_HWNDNEXT)
+
+        # Virtual desktop membership is a COM call, so only ask for visible windows
+        for hwnd in visible:
             try:
-                # Validate handle before checking properties
-                if (
-                    win32gui.IsWindow(hwnd)
-                    and win32gui.IsWindowVisible(hwnd)
-                    and is_window_on_current_desktop(hwnd)
-                ):
+                if is_window_on_current_desktop(hwnd):
                     handles.add(hwnd)
             except Exception:
                 # Skip invalid handles without logging (common during window enumeration)
                 pass
 
-        win32gui.EnumWindows(callback, None)
-
         if desktop_hwnd := win32gui.FindWindow("Progman", None):
             handles.add(desktop_hwnd)
         if taskbar_hwnd := win32gui.FindWindow("Shell_TrayWnd", None):
@@ -619,13 +940,9 @@ class Desktop:
                     "name": active_window.Name,
                     "is_browser": self.is_window_browser(active_window),
                     "depth": 0,
-                    "bounding_box": BoundingBox(
-                        left=active_window.BoundingRectangle.left,
-                        top=active_window.BoundingRectangle.top,
-                        right=active_window.BoundingRectangle.right,
-                        bottom=active_window.BoundingRectangle.bottom,
-                        width=active_window.BoundingRectangle.width(),
-                        height=active_window.BoundingRectangle.height(),
+                    # One UIA read; the Rect it returns is a local copy
+                    "bounding_box": BoundingBox.from_bounding_rectangle(
+                        active_window.BoundingRectangle
                     ),
                     "status": self.get_window_status(active_window),
                     "handle": active_window_handle,
@@ -641,9 +958,14 @@ class Desktop:
         active_window = self.get_window_from_element_handle(handle)
         return active_window
 
+    def get_root_handle(self) -> int:
+        if self._root_handle is None:
+            self._root_handle = uia.GetRootControl().NativeWindowHandle
+        return self._root_handle
+
     def get_window_from_element_handle(self, element_handle: int) -> uia.Control:
         current = uia.ControlFromHandle(element_handle)
-        root_handle = uia.GetRootControl().NativeWindowHandle
+        root_handle = self.get_root_handle()
 
         while True:
             parent = current.GetParentControl()
@@ -651,59 +973,73 @@ class Desktop:
                 return current
             current = parent
 
+    def _get_window(self, hwnd: int, depth: int) -> Window | None:
+        try:
+            # Prefetch everything read below in one cross-process call
+            child = uia.ControlFromHandle(hwnd).BuildUpdatedCache(
+                CacheRequestFactory.create_window_cache()
+            )
+        except Exception:
+            return None
+
+        # Filter out Overlays (e.g. NVIDIA, Steam)
+        if self.is_overlay_window(child):
+            return None
+
+        if not isinstance(child, (uia.WindowControl, uia.PaneControl)):
+            return None
+        if not child.GetCachedPropertyValue(uia.PropertyId.IsWindowPatternAvailableProperty):
+            return None
+        if not (
+            child.GetCachedPropertyValue(uia.PropertyId.WindowCanMinimizeProperty)
+            and child.GetCachedPropertyValue(uia.PropertyId.WindowCanMaximizeProperty)
+        ):
+            return None
+
+        status = self.get_window_status(child)
+
+        bounding_rect = child.CachedBoundingRectangle
+        is_empty = (
+            bounding_rect.right <= bounding_rect.left or bounding_rect.bottom <= bounding_rect.top
+        )
+        if is_empty and status != Status.MINIMIZED:
+            return None
+
+        process_id = child.CachedProcessId
+
+        return Window(
+            **{
+                "name": child.CachedName,
+                "depth": depth,
+                "status": status,
+                "bounding_box": BoundingBox.from_bounding_rectangle(bounding_rect),
+                "handle": child.CachedNativeWindowHandle,
+                "process_id": process_id,
+                "is_browser": self.is_process_browser(process_id),
+            }
+        )
+
     def get_windows(
         self, controls_handles: set[int] | None = None
     ) -> tuple[list[Window], set[int]]:
         try:
-            windows = []
-            window_handles = set()
             controls_handles = controls_handles or self.get_controls_handles()
-            for depth, hwnd in enumerate(controls_handles):
-                try:
-                    child = uia.ControlFromHandle(hwnd)
-                except Exception:
-                    continue
-
-                # Filter out Overlays (e.g. NVIDIA, Steam)
-                if self.is_overlay_window(child):
-                    continue
-
-                if isinstance(child, (uia.WindowControl, uia.PaneControl)):
-                    window_pattern = child.GetPattern(uia.PatternId.WindowPattern)
-                    if window_pattern is None:
-                        continue
-
-                    if window_pattern.CanMinimize and window_pattern.CanMaximize:
-                        status = self.get_window_status(child)
-
-                        bounding_rect = child.BoundingRectangle
-                        if bounding_rect.isempty() and status != Status.MINIMIZED:
-                            continue
-
-                        windows.append(
-                            Window(
-                                **{
-                                    "name": child.Name,
-                                    "depth": depth,
-                                    "status": status,
-                                    "bounding_box": BoundingBox(
-                                        left=bounding_rect.left,
-                                        top=bounding_rect.top,
-                                        right=bounding_rect.right,
-                                        bottom=bounding_rect.bottom,
-                                        width=bounding_rect.width(),
-                                        height=bounding_rect.height(),
-                                    ),
-                                    "handle": child.NativeWindowHandle,
-                                    "process_id": child.ProcessId,
-                                    "is_browser": self.is_window_browser(child),
-                                }
-                            )
-                        )
-                        window_handles.add(child.NativeWindowHandle)
+            if not controls_handles:
+                return [], set()
+            # Each window costs several cross-process UIA calls, so query them concurrently.
+            # COM must be initialized in every worker thread before it touches UIA.
+            with ThreadPoolExecutor(
+                max_workers=min(16, len(controls_handles)),
+                initializer=uia.InitializeUIAutomationInCurrentThread,
+            ) as executor:
+                results = executor.map(
+                    self._get_window, controls_handles, range(len(controls_handles))
+                )
+                windows = [window for window in results if window is not None]
+            window_handles = {window.handle for window in windows}
         except Exception as ex:
             logger.error(f"Error in get_windows: {ex}")
-            windows = []
+            windows, window_handles = [], set()
         return windows, window_handles
 
     def get_xpath_from_element(self, element: uia.Control):
@@ -717,31 +1053,32 @@ class Desktop:
                 # we are at the root node
                 path_parts.append(f"{current.ControlTypeName}")
                 break
-            children = parent.GetChildren()
-            same_type_children = [
-                "-".join(map(lambda x: str(x), child.GetRuntimeId()))
-                for child in children
-                if child.ControlType == current.ControlType
-            ]
-            index = same_type_children.index(
-                "-".join(map(lambda x: str(x), current.GetRuntimeId()))
-            )
-            if same_type_children:
-                path_parts.append(f"{current.ControlTypeName}[{index + 1}]")
+            # Walk siblings up to this element, counting those of the same type. Siblings
+            # after it are never visited and only same-type ones have their RuntimeId read.
+            control_type = current.ControlType
+            runtime_id = current.GetRuntimeId()
+            index = 0
+            sibling = parent.GetFirstChildControl()
+            while sibling is not None:
+                if sibling.ControlType == control_type:
+                    index += 1
+                    if sibling.GetRuntimeId() == runtime_id:
+                        break
+                sibling = sibling.GetNextSiblingControl()
             else:
-                path_parts.append(f"{current.ControlTypeName}")
+                raise ValueError("Element not found among its parent's children")
+            path_parts.append(f"{uia.ControlTypeNames[control_type]}[{index}]")
             current = parent
         path_parts.reverse()
         xpath = "/".join(path_parts)
         return xpath
 
     def get_element_from_xpath(self, xpath: str) -> uia.Control:
-        pattern = re.compile(r"(\w+)(?:\[(\d+)\])?")
         parts = xpath.split("/")
-        root = uia.GetRootControl()
-        element = root
+        # Resolved on the calling thread; a root control from another thread is not usable here
+        element = uia.GetRootControl()
         for part in parts[1:]:
-            match = pattern.fullmatch(part)
+            match = XPATH_PART_RE.fullmatch(part)
             if match is None:
                 continue
             control_type, index = match.groups()
@@ -755,13 +1092,35 @@ class Desktop:
         return element
 
     def get_windows_version(self) -> str:
-        response, status = self.execute_command("(Get-CimInstance Win32_OperatingSystem).Caption")
-        if status == 0:
-            return response.strip()
-        return "Windows"
+        if self._windows_version is None:
+            try:
+                self._windows_version = self._read_windows_caption()
+                return self._windows_version
+            except (OSError, ValueError) as e:
+                logger.debug(f"Failed to read the OS caption from the registry: {e}")
+            response, status = self.execute_internal_command(
+                "(Get-CimInstance Win32_OperatingSystem).Caption"
+            )
+            if status != 0:
+                return "Windows"
+            self._windows_version = response.strip()
+        return self._windows_version
+
+    @staticmethod
+    def _read_windows_caption() -> str:
+        """Same text as Win32_OperatingSystem.Caption, read from the registry."""
+        with winreg.OpenKey(
+            winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows NT\CurrentVersion"
+        ) as key:
+            product_name = winreg.QueryValueEx(key, "ProductName")[0]
+            build = int(winreg.QueryValueEx(key, "CurrentBuildNumber")[0])
+        # Windows 11 still reports "Windows 10 ..." as ProductName; CIM goes by the build
+        if build >= 22000:
+            product_name = product_name.replace("Windows 10", "Windows 11", 1)
+        return f"Microsoft {product_name}"
 
     def get_user_account_type(self) -> str:
-        response, status = self.execute_command(
+        response, status = self.execute_internal_command(
             "(Get-LocalUser -Name $env:USERNAME).PrincipalSource"
         )
         return (
@@ -782,30 +1141,83 @@ class Desktop:
             return 1.0
 
     def get_screen_size(self) -> Size:
+        if self._screen_size is not None and time() - self._screen_size[0] < SCREEN_METRICS_TTL:
+            return self._screen_size[1]
         width, height = uia.GetVirtualScreenSize()
-        return Size(width=width, height=height)
+        size = Size(width=width, height=height)
+        self._screen_size = (time(), size)
+        return size
+
+    def get_scale_factor(self) -> float:
+        """Primary monitor scale factor (1.0 at 100%), cached like the screen size."""
+        if self._scale_factor is not None and time() - self._scale_factor[0] < SCREEN_METRICS_TTL:
+            return self._scale_factor[1]
+        ratio = ctypes.windll.shcore.GetScaleFactorForDevice(0) / 100
+        self._scale_factor = (time(), ratio)
+        return ratio
+
+    def _get_camera(self):
+        """Return the dxcam camera, creating it on first use when the dxcam backend is selected."""
+        if self._camera is None and self.screenshot_backend == "dxcam":
+            try:
+                import dxcam
 
-    def get_screenshot(self, with_cursor: bool = True) -> Image.Image:
-        """Capture screenshot with optional cursor composite (OSWorld-compatible).
+                self._camera = dxcam.create(output_color="RGB")
+            except Exception as e:
+                logger.warning(f"dxcam unavailable, falling back to mss/ImageGrab: {e}")
+                self.screenshot_backend = "mss"
+        return self._camera
 
-        Port of OSWorld desktop_env/server/main.py /screenshot endpoint.
-        Uses win32gui/win32ui to render the cursor and composite it onto the screenshot.
-        DPI scaling is handled via GetScaleFactorForDevice.
+    def _grab_screen(self) -> Image.Image:
+        """Grab the primary screen with the fastest available backend.
+
+        Tries dxcam (when enabled), then mss, then ImageGrab and finally pyautogui.
+        The backend that produced the frame is recorded in _last_screenshot_backend.
         """
+        camera = self._get_camera()
+        if camera is not None:
+            frame = camera.grab()
+            if frame is not None:
+                self._camera_frame = Image.fromarray(frame)
+            # grab() returns None when nothing changed since the last frame, so reuse it
+            if self._camera_frame is not None:
+                self._last_screenshot_backend = "dxcam"
+                return self._camera_frame.copy()
+        try:
+            sct = getattr(self._sct_local, "sct", None)
+            if sct is None:
+                sct = self._sct_local.sct = mss.mss()
+            # monitors[1] is the primary screen, the same area ImageGrab.grab() captures
+            shot = sct.grab(sct.monitors[1])
+            self._last_screenshot_backend = "mss"
+            # shot.raw is mss's own capture buffer; shot.bgra would first copy it to bytes
+            return Image.frombuffer("RGB", shot.size, shot.raw, "raw", "BGRX", 0, 1)
+        except Exception as e:
+            logger.warning(f"mss capture failed, falling back to ImageGrab: {e}")
         try:
             img = ImageGrab.grab(bbox=None, include_layered_windows=True)
+            self._last_screenshot_backend = "imagegrab"
         except Exception:
             logger.warning("Failed to capture with include_layered_windows, falling back")
             img = pg.screenshot()
+            self._last_screenshot_backend = "pyautogui"
+        return img
+
+    def get_screenshot(self, with_cursor: bool = True) -> Image.Image:
+        """Capture screenshot with optional cursor composite (OSWorld-compatible).
+
+        Port of OSWorld desktop_env/server/main.py /screenshot endpoint.
+        Uses win32gui/win32ui to render the cursor and composite it onto the screenshot.
+        DPI scaling is handled via GetScaleFactorForDevice.
+        """
+        img = self._grab_screen()
 
         if not with_cursor:
             return img
 
         # Cursor composite (port of OSWorld)
         try:
-            import win32ui
-
-            ratio = ctypes.windll.shcore.GetScaleFactorForDevice(0) / 100
+            ratio = self.get_scale_factor()
 
             hcursor = win32gui.GetCursorInfo()[1]
             hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
@@ -825,19 +1237,17 @@ class Desktop:
                 "BGRX",
                 0,
                 1,
-            ).convert("RGBA")
+            )
 
             win32gui.DestroyIcon(hcursor)
             win32gui.DeleteObject(hbmp.GetHandle())
             hdc.DeleteDC()
 
-            # Make black pixels transparent
-            pixdata = cursor.load()
-            width, height = cursor.size
-            for y in range(height):
-                for x in range(width):
-                    if pixdata[x, y] == (0, 0, 0, 255):
-                        pixdata[x, y] = (0, 0, 0, 0)
+            # Make black pixels transparent: the alpha band is 0 wherever every channel is 0,
+            # built with band operations instead of a per-pixel Python loop
+            red, green, blue = cursor.split()
+            brightest = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+            cursor.putalpha(brightest.point(lambda value: 255 if value else 0))
 
             hotspot = win32gui.GetIconInfo(hcursor)[1:3]
             pos_win = win32gui.GetCursorPos()
@@ -879,80 +1289,80 @@ class Desktop:
             return screenshot
 
         draw = ImageDraw.Draw(screenshot)
-        try:
-            font = ImageFont.truetype("arial.ttf", 15)
-        except IOError:
-            font = ImageFont.load_default()
+        font = self._font
 
         cp_ns = "https://accessibility.windows.example.org/ns/component"
         val_ns = "https://accessibility.windows.example.org/ns/value"
         class_ns = "https://accessibility.windows.example.org/ns/class"
 
-        index = 1
-        for i, mark in enumerate(marks):
-            x, y, w, h = mark
-            if w <= 0 or h <= 0:
-                continue
+        # Corner coordinates for every drawable mark, computed once ahead of the draw loop
+        boxes = [(x, y, x + w, y + h) for x, y, w, h in marks if w > 0 and h > 0]
 
-            coords = (x, y)
-            bottom_right = (x + w, y + h)
+        # Filter first, then draw by primitive: every outline, every label background, every label.
+        # Grouping the calls keeps each pass on one fill/outline setting and draws labels on top.
+        # Loop-invariant lookups (band count, bound methods) are resolved once, not per mark.
+        single_band = len(screenshot.getbands()) == 1
+        crop, paste = screenshot.crop, screenshot.paste
+        rectangle, text = draw.rectangle, draw.text
 
+        visible = []
+        for box in boxes:
             # Skip single-color regions (OSWorld logic)
             try:
-                cropped = screenshot.crop((*coords, *bottom_right))
-                if len(set(list(cropped.getdata()))) == 1:
+                # Per-band (min, max) is computed in C; a region is one colour when every band is flat
+                extrema = crop(box).getextrema()
+                if single_band:
+                    extrema = (extrema,)
+                if all(low == high for low, high in extrema):
                     continue
             except Exception:
                 pass
-
-            # Draw red rectangle (OSWorld style)
-            draw.rectangle([coords, bottom_right], outline="red", width=1)
-
-            # Draw index at bottom-left with black background (OSWorld style)
-            text_position = (coords[0], bottom_right[1])
-            text_bbox = draw.textbbox(text_position, str(index), font=font, anchor="lb")
-            draw.rectangle(text_bbox, fill="black")
-            draw.text(text_position, str(index), font=font, anchor="lb", fill="white")
-
-            index += 1
+            visible.append(box)
+
+        # Draw red rectangles (OSWorld style)
+        for box in visible:
+            rectangle(box, outline="red", width=1)
+
+        # Draw index at bottom-left with black background (OSWorld style)
+        labels = [
+            ((left, bottom), str(index)) for index, (left, _, _, bottom) in enumerate(visible, 1)
+        ]
+        label_bboxes = self._label_bboxes
+        for (x, y), label in labels:
+            # Label extents relative to the anchor depend only on the text, so each index is
+            # measured once per Desktop and shifted to its position
+            if (bbox := label_bboxes.get(label)) is None:
+                bbox = label_bboxes[label] = font.getbbox(label, anchor="lb")
+            left, top, right, bottom = bbox
+            # A solid paste is a plain region fill; rectangle() goes through the polygon path.
+            # rectangle() includes its right and bottom edges, paste boxes do not.
+            paste("black", (x + left, y + top, x + right + 1, y + bottom + 1))
+        for text_position, label in labels:
+            text(text_position, label, font=font, anchor="lb", fill="white")
 
         return screenshot
 
     def send_notification(self, title: str, message: str) -> str:
-        from xml.sax.saxutils import escape as xml_escape
-
         # Sanitize for XML context (escape <, >, &, ", ')
         safe_title = xml_escape(title, {'"': "&quot;", "'": "&apos;"})
         safe_message = xml_escape(message, {'"': "&quot;", "'": "&apos;"})
 
+        if XmlDocument is not None:
+            try:
+                xml = XmlDocument()
+                xml.load_xml(NOTIFICATION_XML.format(title=safe_title, message=safe_message))
+                notifier = ToastNotificationManager.create_toast_notifier_with_id("Windows MCP")
+                notifier.show(ToastNotification(xml))
+                return f'Notification sent: "{title}" - {message}'
+            except Exception as e:
+                logger.warning(f"winrt toast failed, falling back to PowerShell: {e}")
+
         # Escape for PowerShell single-quoted strings (only single quotes need doubling)
         safe_title_ps = safe_title.replace("'", "''")
         safe_message_ps = safe_message.replace("'", "''")
 
-        # Build script using PS variables assigned via single-quoted strings
-        # (single-quoted strings do NOT expand $() or backtick sequences)
-        ps_script = (
-            "[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null\n"
-            "[Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null\n"
-            f"$notifTitle = '{safe_title_ps}'\n"
-            f"$notifMessage = '{safe_message_ps}'\n"
-            '$template = @"\n'
-            "<toast>\n"
-            "    <visual>\n"
-            '        <binding template="ToastGeneric">\n'
-            "            <text>$notifTitle</text>\n"
-            "            <text>$notifMessage</text>\n"
-            "        </binding>\n"
-            "    </visual>\n"
-            "</toast>\n"
-            '"@\n'
-            "$xml = New-Object Windows.Data.Xml.Dom.XmlDocument\n"
-            "$xml.LoadXml($template)\n"
-            '$notifier = [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Windows MCP")\n'
-            "$toast = New-Object Windows.UI.Notifications.ToastNotification $xml\n"
-            "$notifier.Show($toast)"
-        )
-        response, status = self.execute_command(ps_script)
+        ps_script = NOTIFICATION_SCRIPT.format(title=safe_title_ps, message=safe_message_ps)
+        response, status = self.execute_internal_command(ps_script)
         if status == 0:
             return f'Notification sent: "{title}" - {message}'
         else:
@@ -964,28 +1374,37 @@ class Desktop:
         sort_by: Literal["memory", "cpu", "name"] = "memory",
         limit: int = 20,
     ) -> str:
-        import psutil
-        from tabulate import tabulate
-
-        procs = []
-        for p in psutil.process_iter(["pid", "name", "cpu_percent", "memory_info"]):
-            try:
-                info = p.info
-                mem_mb = info["memory_info"].rss / (1024 * 1024) if info["memory_info"] else 0
-                procs.append(
-                    {
-                        "pid": info["pid"],
-                        "name": info["name"] or "Unknown",
-                        "cpu": info["cpu_percent"] or 0,
-                        "mem_mb": round(mem_mb, 1),
-                    }
-                )
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        processes = snapshot_processes()
+        cpu = None
+        if sort_by == "cpu":
+            # CPU usage is the change in CPU time between two snapshots; the second snapshot and
+            # the wait are only paid when sorting by it
+            start = time()
+            pg.sleep(CPU_SAMPLE_INTERVAL)
+            before, processes = processes, snapshot_processes()
+            cpu = cpu_percentages(before, processes, time() - start)
+
+        procs = [
+            {
+                "pid": p.pid,
+                "name": p.name,
+                "cpu": cpu.get(p.pid, 0.0) if cpu is not None else None,
+                "mem_mb": round(p.memory / (1024 * 1024), 1),
+            }
+            for p in processes
+        ]
         if name:
-            from thefuzz import fuzz
-
-            procs = [p for p in procs if fuzz.partial_ratio(name.lower(), p["name"].lower()) > 60]
+            # Scores every process name in one rapidfuzz call; each match carries its index into
+            # the names, which maps it back to procs
+            matches = process.extract(
+                name,
+                [p["name"] for p in procs],
+                scorer=fuzz.partial_ratio,
+                processor=str.lower,
+                score_cutoff=60,
+                limit=None,
+            )
+            procs = [procs[index] for _, score, index in matches if score > 60]
         sort_key = {
             "memory": lambda x: x["mem_mb"],
             "cpu": lambda x: x["cpu"],
@@ -995,18 +1414,12 @@ class Desktop:
         procs = procs[:limit]
         if not procs:
             return f"No processes found{f' matching {name}' if name else ''}."
-        table = tabulate(
-            [[p["pid"], p["name"], f"{p['cpu']:.1f}%", f"{p['mem_mb']:.1f} MB"] for p in procs],
-            headers=["PID", "Name", "CPU%", "Memory"],
-            tablefmt="simple",
-        )
+        table = format_process_table(procs)
         return f"Processes ({len(procs)} shown):\n{table}"
 
     def kill_process(
         self, name: str | None = None, pid: int | None = None, force: bool = False
     ) -> str:
-        import psutil
-
         if pid is None and name is None:
             return "Error: Provide either pid or name parameter for kill mode."
         killed = []
@@ -1024,55 +1437,81 @@ class Desktop:
             except psutil.AccessDenied:
                 return f"Access denied to kill PID {pid}. Try running as administrator."
         else:
-            for p in psutil.process_iter(["pid", "name"]):
+            # Match on the handle-free snapshot first; only matches are opened and signalled
+            target = name.lower()
+            matches = [p for p in snapshot_processes() if p.name.lower() == target]
+            denied = []
+            for match in matches:
                 try:
-                    if p.info["name"] and p.info["name"].lower() == name.lower():
-                        if force:
-                            p.kill()
-                        else:
-                            p.terminate()
-                        killed.append(f"{p.info['name']} (PID {p.info['pid']})")
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    p = psutil.Process(match.pid)
+                    if force:
+                        p.kill()
+                    else:
+                        p.terminate()
+                    killed.append(f"{match.name} (PID {match.pid})")
+                except psutil.NoSuchProcess:
                     continue
+                except psutil.AccessDenied:
+                    denied.append(f"{match.name} (PID {match.pid})")
+            if denied:
+                summary = f"Access denied: {', '.join(denied)}"
+                if not killed:
+                    return f"{summary}. Try running as administrator."
+                return (
+                    f"{'Force killed' if force else 'Terminated'}: {', '.join(killed)}. {summary}"
+                )
         if not killed:
-            return f'No process matching "{name}" found or access denied.'
+            return f'No process matching "{name}" found.'
         return f"{'Force killed' if force else 'Terminated'}: {', '.join(killed)}"
 
     def lock_screen(self) -> str:
         ctypes.windll.user32.LockWorkStation()
         return "Screen locked."
 
-    def get_system_info(self) -> str:
-        import psutil
-        import platform
-        from datetime import datetime, timedelta
+    def _sample_cpu_percent(self):
+        while not self._cpu_sampler_stop.is_set():
+            self._cpu_percent = psutil.cpu_percent(interval=CPU_PERCENT_INTERVAL)
+
+    def _start_cpu_sampler(self):
+        with self._cpu_sampler_lock:
+            if self._cpu_sampler is None and not self._cpu_sampler_stop.is_set():
+                self._cpu_sampler = threading.Thread(
+                    target=self._sample_cpu_percent, name="cpu-sampler", daemon=True
+                )
+                self._cpu_sampler.start()
 
-        cpu_pct = psutil.cpu_percent(interval=1)
+    def get_system_info(self) -> str:
+        self._start_cpu_sampler()
+        cpu_pct = self._cpu_percent
+        if cpu_pct is None:  # The sampler has not finished its first interval yet
+            cpu_pct = psutil.cpu_percent(interval=CPU_PERCENT_INTERVAL)
         cpu_count = psutil.cpu_count()
-        mem = psutil.virtual_memory()
-        disk = psutil.disk_usage("C:\\")
+        mem_used, mem_total = get_memory_usage()
+        disk_used, disk_total = get_disk_usage("C:\\")
         boot = datetime.fromtimestamp(psutil.boot_time())
         uptime = datetime.now() - boot
         uptime_str = str(timedelta(seconds=int(uptime.total_seconds())))
         net = psutil.net_io_counters()
-        from textwrap import dedent
-
         return dedent(f"""System Information:
   OS: {platform.system()} {platform.release()} ({platform.version()})
   Machine: {platform.machine()}
 
   CPU: {cpu_pct}% ({cpu_count} cores)
-  Memory: {mem.percent}% used ({round(mem.used / 1024**3, 1)} / {round(mem.total / 1024**3, 1)} GB)
-  Disk C: {disk.percent}% used ({round(disk.used / 1024**3, 1)} / {round(disk.total / 1024**3, 1)} GB)
+  Memory: {round(mem_used / mem_total * 100, 1)}% used ({round(mem_used / 1024**3, 1)} / {round(mem_total / 1024**3, 1)} GB)
+  Disk C: {round(disk_used / disk_total * 100, 1)}% used ({round(disk_used / 1024**3, 1)} / {round(disk_total / 1024**3, 1)} GB)
 
   Network: ↑ {round(net.bytes_sent / 1024**2, 1)} MB sent, ↓ {round(net.bytes_recv / 1024**2, 1)} MB received
   Uptime: {uptime_str} (booted {boot.strftime("%Y-%m-%d %H:%M")})""")
 
     @contextmanager
     def auto_minimize(self):
+        handle = uia.GetForegroundWindow()
+        # Leave an already minimized window alone, and do not restore it afterwards
+        if not handle or uia.IsIconic(handle):
+            yield
+            return
+        uia.ShowWindow(handle, win32con.SW_MINIMIZE)
         try:
-            handle = uia.GetForegroundWindow()
-            uia.ShowWindow(handle, win32con.SW_MINIMIZE)
             yield
         finally:
             uia.ShowWindow(handle, win32con.SW_RESTORE)
@@ -62,6 +62,7 @@ class DesktopState:
     windows: list[Window]
     screenshot: Image | None = None
     tree_state: TreeState | None = None
+    screenshot_backend: str | None = None
 
     def active_desktop_to_string(self):
         desktop_name = self.active_desktop.get("name")
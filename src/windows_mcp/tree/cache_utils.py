@@ -56,6 +56,31 @@ class CacheRequestFactory:
 
         return cache_request
 
+    @staticmethod
+    def create_window_cache() -> CacheRequest:
+        """
+        Creates a cache request for top-level window enumeration.
+        Caches the properties Desktop.get_windows reads for every window,
+        so each window costs one cross-process round trip.
+
+        Returns:
+            CacheRequest configured for a single window element
+        """
+        cache_request = CacheRequest()
+        cache_request.TreeScope = TreeScope.TreeScope_Element
+
+        cache_request.AddProperty(PropertyId.NameProperty)
+        cache_request.AddProperty(PropertyId.ProcessIdProperty)
+        cache_request.AddProperty(PropertyId.NativeWindowHandleProperty)
+        cache_request.AddProperty(PropertyId.BoundingRectangleProperty)
+
+        # WindowPattern state, read as properties instead of fetching the pattern
+        cache_request.AddProperty(PropertyId.IsWindowPatternAvailableProperty)
+        cache_request.AddProperty(PropertyId.WindowCanMinimizeProperty)
+        cache_request.AddProperty(PropertyId.WindowCanMaximizeProperty)
+
+        return cache_request
+
 
 class CachedControlHelper:
     """Helper class for working with cached controls."""
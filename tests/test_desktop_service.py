@@ -0,0 +1,21 @@
+from windows_mcp.desktop.service import parse_shortcut
+
+
+class TestParseShortcut:
+    def test_split_and_lowercase(self):
+        assert parse_shortcut("Ctrl+Shift+Esc") == ("ctrl", "shift", "esc")
+
+    def test_single_character_keeps_case(self):
+        assert parse_shortcut("ctrl+A") == ("ctrl", "A")
+
+    def test_whitespace_stripped(self):
+        assert parse_shortcut(" ctrl + c ") == ("ctrl", "c")
+
+    def test_single_key(self):
+        assert parse_shortcut("Enter") == ("enter",)
+
+    def test_memoized(self):
+        parse_shortcut.cache_clear()
+        parse_shortcut("alt+tab")
+        parse_shortcut("alt+tab")
+        assert parse_shortcut.cache_info().hits == 1
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import fastapi_server
+from fastapi_server import (
+    ClickToolRequest,
+    DragToolRequest,
+    ResizeToolRequest,
+    ToolResponse,
+    resolve_local_path,
+)
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager, so the lifespan (and its Desktop) never starts
+    return TestClient(fastapi_server.app)
+
+
+class TestResolveLocalPath:
+    def test_relative_path_against_home(self):
+        expected = os.path.join(os.path.expanduser("~"), "notes.txt")
+        assert resolve_local_path("notes.txt") == expected
+
+    def test_home_shorthand(self):
+        expected = os.path.join(os.path.expanduser("~"), "Desktop", "a.txt")
+        assert resolve_local_path(os.path.join("~", "Desktop", "a.txt")) == expected
+
+    def test_absolute_path_unchanged(self):
+        path = os.path.abspath(os.path.join(os.sep, "tmp", "a.txt"))
+        assert resolve_local_path(path) == path
+
+    def test_unc_path(self):
+        assert resolve_local_path("\\\\server\\share\\a.txt") is None
+        assert resolve_local_path("//server/share/a.txt") is None
+
+    def test_wildcards(self):
+        assert resolve_local_path("*.txt") is None
+        assert resolve_local_path("file?.txt") is None
+        assert resolve_local_path("file[1].txt") is None
+
+    def test_provider_paths(self):
+        assert resolve_local_path("HKLM:\\Software") is None
+        assert resolve_local_path("Env:PATH") is None
+
+
+class TestXYValidation:
+    def test_pair_accepted(self):
+        assert ClickToolRequest(loc=[10, 20]).loc == (10, 20)
+
+    def test_numeric_strings_coerced(self):
+        assert DragToolRequest(from_loc=["1", "2"], to_loc=[3, 4]).from_loc == (1, 2)
+
+    @pytest.mark.parametrize("loc", [[10], [10, 20, 30], [], ["a", 1], [1.5, 2]])
+    def test_invalid_rejected(self, loc):
+        with pytest.raises(ValidationError):
+            ClickToolRequest(loc=loc)
+
+    def test_optional_pair(self):
+        assert ResizeToolRequest().size is None
+        assert ResizeToolRequest(size=[800, 600]).size == (800, 600)
+
+    def test_endpoint_returns_422(self, client):
+        response = client.post("/tools/click", json={"loc": [1]})
+        assert response.status_code == 422
+
+
+class TestBatch:
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = []
+
+        async def ok(action):
+            calls.append(action.op)
+            return ToolResponse(result=f"{action.op} done")
+
+        async def fail(action):
+            calls.append(action.op)
+            raise HTTPException(status_code=400, detail="Invalid key")
+
+        for op in fastapi_server.BATCH_HANDLERS:
+            monkeypatch.setitem(fastapi_server.BATCH_HANDLERS, op, ok)
+        monkeypatch.setitem(fastapi_server.BATCH_HANDLERS, "key", fail)
+        return calls
+
+    def test_runs_in_order(self, client, calls):
+        body = {
+            "actions": [
+                {"op": "click", "loc": [1, 2]},
+                {"op": "type", "text": "hi"},
+                {"op": "wait", "duration": 0},
+            ]
+        }
+        response = client.post("/tools/batch", json=body)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert [r["op"] for r in data["result"]] == ["click", "type", "wait"]
+        assert calls == ["click", "type", "wait"]
+
+    def test_stops_at_first_error(self, client, calls):
+        body = {
+            "actions": [
+                {"op": "click", "loc": [1, 2]},
+                {"op": "key", "key": "bogus"},
+                {"op": "wait", "duration": 0},
+            ]
+        }
+        data = client.post("/tools/batch", json=body).json()
+        assert data["status"] == "error"
+        assert data["result"][-1] == {"op": "key", "result": "Invalid key", "status": "error"}
+        assert calls == ["click", "key"]
+
+    def test_invalid_action_rejected_before_running(self, client, calls):
+        body = {"actions": [{"op": "wait", "duration": 0}, {"op": "click", "loc": [1]}]}
+        response = client.post("/tools/batch", json=body)
+        assert response.status_code == 422
+        assert calls == []
+
+    def test_unknown_op_rejected(self, client, calls):
+        response = client.post("/tools/batch", json={"actions": [{"op": "drag"}]})
+        assert response.status_code == 422
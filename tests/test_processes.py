@@ -0,0 +1,63 @@
+import pytest
+
+from windows_mcp.desktop.processes import ProcessInfo, cpu_percentages, format_process_table
+
+
+def make_process(pid, cpu_time, name="app.exe"):
+    return ProcessInfo(pid=pid, name=name, memory=0, cpu_time=cpu_time)
+
+
+class TestCpuPercentages:
+    def test_delta_over_elapsed(self):
+        before = [make_process(1, 1.0), make_process(2, 5.0)]
+        after = [make_process(1, 1.05), make_process(2, 5.2)]
+        result = cpu_percentages(before, after, 0.1)
+        assert result[1] == pytest.approx(50.0)
+        assert result[2] == pytest.approx(200.0)
+
+    def test_new_process_skipped(self):
+        before = [make_process(1, 1.0)]
+        after = [make_process(1, 1.0), make_process(2, 3.0)]
+        assert cpu_percentages(before, after, 0.1) == {1: 0.0}
+
+    def test_exited_process_skipped(self):
+        before = [make_process(1, 1.0), make_process(2, 3.0)]
+        after = [make_process(1, 1.0)]
+        assert cpu_percentages(before, after, 0.1) == {1: 0.0}
+
+    def test_negative_delta_clamped(self):
+        # A reused pid can report less CPU time than the process it replaced
+        before = [make_process(1, 10.0)]
+        after = [make_process(1, 2.0)]
+        assert cpu_percentages(before, after, 0.1) == {1: 0.0}
+
+    def test_zero_elapsed(self):
+        before = [make_process(1, 1.0)]
+        after = [make_process(1, 2.0)]
+        assert cpu_percentages(before, after, 0) == {}
+
+
+class TestFormatProcessTable:
+    def test_layout(self):
+        procs = [
+            {"pid": 4, "name": "System", "cpu": 1.25, "mem_mb": 0.1},
+            {"pid": 12345, "name": "chrome.exe", "cpu": 12.0, "mem_mb": 512.0},
+        ]
+        assert format_process_table(procs) == (
+            "  PID  Name        CPU%   Memory\n"
+            "-----  ----------  -----  --------\n"
+            "    4  System      1.2%   0.1 MB\n"
+            "12345  chrome.exe  12.0%  512.0 MB"
+        )
+
+    def test_cpu_not_sampled(self):
+        procs = [{"pid": 1, "name": "a.exe", "cpu": None, "mem_mb": 2.0}]
+        lines = format_process_table(procs).splitlines()
+        assert lines[2] == "  1  a.exe  -     2.0 MB"
+
+    def test_no_trailing_whitespace(self):
+        procs = [
+            {"pid": 1, "name": "a.exe", "cpu": None, "mem_mb": 2.0},
+            {"pid": 2, "name": "b.exe", "cpu": None, "mem_mb": 1024.0},
+        ]
+        assert all(line == line.rstrip() for line in format_process_table(procs).splitlines())